@@ -17,8 +17,12 @@ import sys
 import os
 import json
 import pickle
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 
 # Add modules to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -26,10 +30,27 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 import numpy as np
 import cv2
 
+try:
+    import numba
+    from numba import njit, prange
+    # TBB hangs at interpreter exit once a kernel has run on a worker thread
+    if 'NUMBA_THREADING_LAYER_PRIORITY' not in os.environ:
+        numba.config.THREADING_LAYER_PRIORITY = ['omp', 'workqueue', 'tbb']
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import piexif
+    PIEXIF_AVAILABLE = True
+except ImportError:
+    PIEXIF_AVAILABLE = False
+
 # Import Verifiers
 from modules.weather_verifier import WeatherVerifier
 from modules.geolocation_verifier import GeolocationVerifier
 from modules.fraud_detector import FraudDetector
+from modules.crop_damage_insurance import majority_class
 
 # Load config from pkl
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), 'config.pkl')
@@ -52,76 +73,282 @@ def load_config():
     }
 
 CONFIG = load_config()
+DAMAGE_NAMES = CONFIG.get('DAMAGE_NAMES', {})
+DAMAGE_CLASSES = CONFIG.get('DAMAGE_CLASSES', ['DR', 'G', 'ND', 'WD', 'other'])
+DAMAGE_CLASS_INDEX = {code: i for i, code in enumerate(DAMAGE_CLASSES)}
+
+# Images above this pixel count are downscaled to ANALYSIS_WIDTH before analysis.
+# The indices are then approximate: averaging pixels moves some across the
+# ExG/ExR/soil thresholds, which shifts damage % by up to about a point on
+# finely textured 12 MP photos
+ANALYSIS_MAX_PIXELS = 1_000_000
+ANALYSIS_WIDTH = 1024
+
+# Claims with more images than this are analyzed in a process pool (multi-core
+# hosts only). Spawning workers costs seconds, so the pool is started once and
+# kept for later claims; below this, threads are as fast.
+PROCESS_POOL_MIN_IMAGES = 32
 
 
 # ============================================================================
 # RGB DAMAGE ANALYZER (No ML required)
 # ============================================================================
-def analyze_damage_rgb(image_path: str) -> Dict:
+# Numba's parallel runtime must not be entered from several threads at once
+# (and first-call compilation must not race); the kernel already uses all cores.
+_KERNEL_LOCK = threading.Lock()
+
+if NUMBA_AVAILABLE:
+    def _rgb_stats(bgr, gray):
+        """
+        Fused single-pass ExG/ExR/damage kernel over a BGR uint8 image and
+        its cv2 grayscale. Returns (avg_exg, avg_exr, damage_percentage).
+        """
+        h, w = bgr.shape[0], bgr.shape[1]
+        row_exg = np.zeros(h, dtype=np.float64)
+        row_exr = np.zeros(h, dtype=np.float64)
+        row_damage = np.zeros(h, dtype=np.int64)
+
+        for y in prange(h):
+            sum_exg = 0.0
+            sum_exr = 0.0
+            damage_count = 0
+            for x in range(w):
+                b = np.float32(bgr[y, x, 0])
+                g = np.float32(bgr[y, x, 1])
+                r = np.float32(bgr[y, x, 2])
+                total = r + g + b + np.float32(1e-6)
+                # Same float32 operation order as the NumPy path (no fastmath),
+                # so pixels land on the same side of the ExG/ExR thresholds
+                nb = b / total
+                ng = g / total
+                nr = r / total
+                exg = np.float32(2) * ng - nb - nr
+                # ExR uses channel 0, matching the NumPy path (RGB image
+                # unpacked as b, g, r) the thresholds were calibrated on
+                exr = np.float32(1.4) * nb - ng
+                luma = gray[y, x]
+
+                sum_exg += exg
+                sum_exr += exr
+
+                # Stress, or soil without healthy vegetation; thresholds are
+                # float32 like NumPy's array-vs-scalar comparisons
+                if exr > np.float32(0.1) or (luma > 80 and luma < 180 and not exg > np.float32(0.05)):
+                    damage_count += 1
+
+            row_exg[y] = sum_exg
+            row_exr[y] = sum_exr
+            row_damage[y] = damage_count
+
+        n_pixels = h * w
+        return (row_exg.sum() / n_pixels,
+                row_exr.sum() / n_pixels,
+                100.0 * row_damage.sum() / n_pixels)
+
+    # Explicit signature: compiled eagerly at import and, with cache=True, loaded
+    # from __pycache__ on later runs instead of re-JITting per CLI invocation
+    try:
+        _rgb_stats = njit('UniTuple(float64, 3)(uint8[:, :, ::1], uint8[:, ::1])',
+                          parallel=True, cache=True)(_rgb_stats)
+    except ImportError:
+        # The disk cache was written with this file imported under another
+        # module name (e.g. __main__ vs cropfarmPY.main_pipeline); compile fresh
+        _rgb_stats = njit('UniTuple(float64, 3)(uint8[:, :, ::1], uint8[:, ::1])',
+                          parallel=True)(_rgb_stats)
+
+
+def _read_image_for_analysis(image_path: str, display_size: Optional[Tuple[int, int]] = None
+                             ) -> Tuple[Optional[np.ndarray], Optional[Tuple[int, int]]]:
     """
-    Analyze crop damage using RGB vegetation indices.
-    Returns damage percentage and type.
+    Decode at the coarsest JPEG DCT scale (1/2, 1/4, 1/8) that still leaves
+    ANALYSIS_WIDTH pixels, so libjpeg skips most of the IDCT work. The scale
+    comes from display_size, the (height, width) recorded in EXIF (see
+    get_exif_metadata); without it the image is decoded in full.
+    Returns (BGR image, original (height, width)).
     """
+    factor, flag = 1, cv2.IMREAD_COLOR
+    if display_size:
+        height, width = display_size
+        for factor, flag in ((8, cv2.IMREAD_REDUCED_COLOR_8),
+                             (4, cv2.IMREAD_REDUCED_COLOR_4),
+                             (2, cv2.IMREAD_REDUCED_COLOR_2),
+                             (1, cv2.IMREAD_COLOR)):
+            if width // factor >= ANALYSIS_WIDTH:
+                break
+    
+    img = cv2.imread(image_path, flag)
+    if img is None or factor == 1:
+        return img, (img.shape[:2] if img is not None else None)
+    
+    # libjpeg rounds scaled sizes up; anything else means the EXIF size is stale
+    if img.shape[:2] == (-(-height // factor), -(-width // factor)):
+        return img, (height, width)
     img = cv2.imread(image_path)
+    return img, (img.shape[:2] if img is not None else None)
+
+
+def _rgb_indices(image_path: str, display_size: Optional[Tuple[int, int]] = None) -> Dict:
+    """
+    Unrounded RGB vegetation indices for one image:
+    {'avg_exg', 'avg_exr', 'damage_percentage', 'image_size'} or {'error'}.
+    Images over ANALYSIS_MAX_PIXELS are analyzed downscaled, so their
+    indices approximate the full-resolution ones.
+    """
+    img, img_original_shape = _read_image_for_analysis(image_path, display_size)
     if img is None:
         return {'error': f'Could not load image: {image_path}'}
     
-    img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB).astype(np.float32)
-    b, g, r = cv2.split(img_rgb)
-    total = r + g + b + 1e-6
+    # Analyze ~1024px wide
+    if img.shape[0] * img.shape[1] > ANALYSIS_MAX_PIXELS:
+        height = int(ANALYSIS_WIDTH * img.shape[0] / img.shape[1])
+        img = cv2.resize(img, (ANALYSIS_WIDTH, height), interpolation=cv2.INTER_AREA)
     
-    # Excess Green Index (healthy vegetation = high)
-    exg = 2 * (g / total) - (r / total) - (b / total)
-    avg_exg = float(np.mean(exg))
-    
-    # Excess Red Index (stressed/brown = high)
-    exr = 1.4 * (r / total) - (g / total)
-    avg_exr = float(np.mean(exr))
-    
-    # Soil detection
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    soil_mask = ((gray > 80) & (gray < 180)).astype(np.float32)
-    
-    # Healthy vegetation mask
-    healthy_mask = (exg > 0.05).astype(np.float32)
-    
-    # Stress mask
-    stress_mask = (exr > 0.1).astype(np.float32)
-    
-    # Combined damage mask
-    damage_mask = np.clip(stress_mask + soil_mask * (1 - healthy_mask), 0, 1)
-    damage_percentage = float(np.mean(damage_mask) * 100)
-    
-    # Infer damage type from indices
-    if avg_exg > 0.1:
-        damage_type_code = 'G'  # Good/Healthy
-    elif avg_exr > 0.15:
-        damage_type_code = 'DR'  # Drought (brown/dead)
-    elif avg_exg < -0.1:
-        damage_type_code = 'ND'  # Nutrient Deficiency (yellowing)
-    elif 0 < avg_exg < 0.1 and avg_exr > 0.05:
-        damage_type_code = 'WD'  # Weed Damage (mixed patterns)
+    if NUMBA_AVAILABLE:
+        bgr = np.ascontiguousarray(img)
+        # cv2's fixed-point gray, so the soil band matches the NumPy path exactly
+        gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+        with _KERNEL_LOCK:
+            avg_exg, avg_exr, damage_percentage = _rgb_stats(bgr, gray)
+        avg_exg, avg_exr, damage_percentage = float(avg_exg), float(avg_exr), float(damage_percentage)
     else:
-        damage_type_code = 'other'
-    
-    damage_names = CONFIG.get('DAMAGE_NAMES', {})
-    damage_type_name = damage_names.get(damage_type_code, 'Unknown')
+        # Work on the BGR buffer directly; no BGR2RGB copy just to reorder
+        img_f = img.astype(np.float32)
+        total = np.add(img_f[..., 0], img_f[..., 1])
+        total += img_f[..., 2]
+        total += 1e-6
+        
+        # Normalized channels in one buffer
+        norm = np.divide(img_f, total[..., None], out=img_f)
+        blue, green, red = norm[..., 0], norm[..., 1], norm[..., 2]
+        
+        # Excess Green Index (healthy vegetation = high)
+        exg = np.multiply(green, 2)
+        exg -= blue
+        exg -= red
+        avg_exg = float(np.mean(exg))
+        
+        # Excess Red Index (stressed/brown = high). Uses the blue channel,
+        # like _rgb_stats: the thresholds were calibrated on that
+        exr = np.multiply(blue, 1.4, dtype=np.float32)
+        exr -= green
+        avg_exr = float(np.mean(exr))
+        
+        # Soil detection (80 < gray < 180) via OpenCV's SIMD range check on uint8
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        soil_mask = cv2.inRange(gray, 81, 179).astype(bool)
+        
+        # Healthy vegetation mask
+        healthy_mask = exg > 0.05
+        
+        # Stress mask
+        stress_mask = exr > 0.1
+        
+        # Combined damage mask
+        damage_mask = stress_mask | (soil_mask & ~healthy_mask)
+        damage_percentage = 100.0 * cv2.countNonZero(damage_mask.view(np.uint8)) / damage_mask.size
     
     return {
-        'damage_percentage': round(damage_percentage, 1),
+        'avg_exg': avg_exg,
+        'avg_exr': avg_exr,
+        'damage_percentage': damage_percentage,
+        'image_size': list(img_original_shape)
+    }
+
+
+def classify_batch(exg_arr: np.ndarray, exr_arr: np.ndarray) -> np.ndarray:
+    """Infer damage type codes from per-image mean ExG/ExR, for all images at once"""
+    exg = np.asarray(exg_arr)
+    exr = np.asarray(exr_arr)
+    return np.select(
+        [exg > 0.1,                             # Good/Healthy
+         exr > 0.15,                            # Drought (brown/dead)
+         exg < -0.1,                            # Nutrient Deficiency (yellowing)
+         (exg > 0) & (exg < 0.1) & (exr > 0.05)],  # Weed Damage (mixed patterns)
+        ['G', 'DR', 'ND', 'WD'],
+        default='other'
+    )
+
+
+def _format_analysis(indices: Dict, damage_type_code: str) -> Dict:
+    """Per-image analysis result from raw indices and a damage type code"""
+    return {
+        'damage_percentage': round(indices['damage_percentage'], 1),
         'damage_type_code': damage_type_code,
-        'damage_type_name': damage_type_name,
-        'vegetation_index': round(avg_exg, 3),
-        'stress_index': round(avg_exr, 3),
-        'image_size': list(img.shape[:2])
+        'damage_type_name': DAMAGE_NAMES.get(damage_type_code, 'Unknown'),
+        'vegetation_index': round(indices['avg_exg'], 3),
+        'stress_index': round(indices['avg_exr'], 3),
+        'image_size': indices['image_size']
     }
 
 
+def analyze_damage_rgb(image_path: str) -> Dict:
+    """
+    Analyze crop damage using RGB vegetation indices.
+    Returns damage percentage and type.
+    """
+    indices = _rgb_indices(image_path, get_exif_metadata(image_path)['display_size'])
+    if 'error' in indices:
+        return indices
+    
+    damage_type_code = str(classify_batch(indices['avg_exg'], indices['avg_exr']))
+    return _format_analysis(indices, damage_type_code)
+
+
 # ============================================================================
-# EXIF COORDINATE EXTRACTOR
+# EXIF METADATA EXTRACTOR
 # ============================================================================
-def get_exif_coordinates(image_path: str) -> Optional[Dict]:
-    """Extract GPS coordinates from EXIF data"""
+def _exif_metadata_piexif(image_path: str) -> Dict:
+    """Read only the APP1 EXIF segment via piexif (no image decoding)"""
+    metadata = {'coords': None, 'timestamp': None, 'display_size': None}
+    try:
+        exif = piexif.load(image_path)
+    except Exception:
+        return metadata
+    
+    width = exif.get('Exif', {}).get(piexif.ExifIFD.PixelXDimension)
+    height = exif.get('Exif', {}).get(piexif.ExifIFD.PixelYDimension)
+    if width and height:
+        # cv2.imread applies EXIF Orientation; 5-8 turn the image 90 degrees
+        if exif.get('0th', {}).get(piexif.ImageIFD.Orientation) in (5, 6, 7, 8):
+            width, height = height, width
+        metadata['display_size'] = (height, width)
+    
+    ts = exif.get('Exif', {}).get(piexif.ExifIFD.DateTimeOriginal)
+    if ts:
+        metadata['timestamp'] = ts.decode('ascii', errors='ignore') if isinstance(ts, bytes) else ts
+    
+    gps_info = exif.get('GPS') or {}
+    if not gps_info:
+        return metadata
+    
+    def convert_to_degrees(value):
+        d, m, s = (num / den for num, den in value)
+        return d + m / 60 + s / 3600
+    
+    try:
+        lat = convert_to_degrees(gps_info.get(piexif.GPSIFD.GPSLatitude, ((0, 1), (0, 1), (0, 1))))
+        lon = convert_to_degrees(gps_info.get(piexif.GPSIFD.GPSLongitude, ((0, 1), (0, 1), (0, 1))))
+    except Exception:
+        return metadata
+    
+    if gps_info.get(piexif.GPSIFD.GPSLatitudeRef, b'N') == b'S':
+        lat = -lat
+    if gps_info.get(piexif.GPSIFD.GPSLongitudeRef, b'E') == b'W':
+        lon = -lon
+    
+    metadata['coords'] = {'lat': lat, 'lon': lon}
+    return metadata
+
+def get_exif_metadata(image_path: str) -> Dict:
+    """
+    Extract GPS coordinates and capture timestamp from EXIF data.
+    Opens the image once and returns {'coords': {...} or None, 'timestamp': str or None,
+    'display_size': (height, width) as cv2.imread orients it, or None}.
+    """
+    if PIEXIF_AVAILABLE:
+        return _exif_metadata_piexif(image_path)
+    
+    metadata = {'coords': None, 'timestamp': None, 'display_size': None}
     try:
         from PIL import Image
         from PIL.ExifTags import TAGS, GPSTAGS
@@ -130,10 +357,13 @@ def get_exif_coordinates(image_path: str) -> Optional[Dict]:
         exif_data = img._getexif()
         
         if not exif_data:
-            return None
+            return metadata
         
         gps_info = {}
         for tag_id, value in exif_data.items():
+            if tag_id == 36867: # DateTimeOriginal
+                metadata['timestamp'] = value
+                continue
             tag = TAGS.get(tag_id, tag_id)
             if tag == 'GPSInfo':
                 for gps_tag_id, gps_value in value.items():
@@ -141,7 +371,7 @@ def get_exif_coordinates(image_path: str) -> Optional[Dict]:
                     gps_info[gps_tag] = gps_value
         
         if not gps_info:
-            return None
+            return metadata
         
         def convert_to_degrees(value):
             d, m, s = value
@@ -155,22 +385,76 @@ def get_exif_coordinates(image_path: str) -> Optional[Dict]:
         if gps_info.get('GPSLongitudeRef', 'E') == 'W':
             lon = -lon
         
-        return {'lat': lat, 'lon': lon}
+        metadata['coords'] = {'lat': lat, 'lon': lon}
     
     except Exception as e:
-        return None
-
-def get_exif_timestamp(image_path: str) -> Optional[str]:
-    """Extract timestamp from EXIF"""
-    try:
-        from PIL import Image
-        img = Image.open(image_path)
-        exif = img._getexif()
-        if exif:
-            return exif.get(36867) # DateTimeOriginal
-    except:
         pass
-    return None
+    
+    return metadata
+
+def get_exif_coordinates(image_path: str) -> Optional[Dict]:
+    """Extract GPS coordinates from EXIF data"""
+    return get_exif_metadata(image_path)['coords']
+
+
+# ============================================================================
+# PER-IMAGE WORKERS
+# ============================================================================
+def _analyze_one_image(path: str) -> Tuple[Dict, Optional[Dict], Optional[str]]:
+    """Raw RGB indices + EXIF metadata for one image: (indices, coords, timestamp)"""
+    # Skip missing files before cv2.imread, which would log a WARN for them
+    if not os.path.exists(path):
+        return {'error': f'Image not found: {path}'}, None, None
+    metadata = get_exif_metadata(path)
+    indices = _rgb_indices(path, metadata['display_size'])
+    if 'error' in indices:
+        return indices, None, None
+    return indices, metadata['coords'], metadata['timestamp']
+
+def _worker_init():
+    """Process-pool initializer: one kernel thread per worker, JIT warmed up front"""
+    if NUMBA_AVAILABLE:
+        numba.set_num_threads(1)
+        _rgb_stats(np.zeros((64, 64, 3), dtype=np.uint8), np.zeros((64, 64), dtype=np.uint8))
+
+_process_pool = None
+_process_pool_failed = False
+_process_pool_lock = threading.Lock()
+
+def _get_process_pool() -> Optional[ProcessPoolExecutor]:
+    """Long-lived worker pool shared by all claims; None once it has failed"""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None and not _process_pool_failed:
+            _process_pool = ProcessPoolExecutor(max_workers=os.cpu_count(),
+                                                mp_context=multiprocessing.get_context('spawn'),
+                                                initializer=_worker_init)
+        return _process_pool
+
+def _discard_process_pool(error: Exception):
+    """Stop using processes (e.g. __main__ can't be re-imported by spawned workers)"""
+    global _process_pool, _process_pool_failed
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+        _process_pool_failed = True
+    print(f"[WARNING] Process pool unavailable, using threads: {error!r}", file=sys.stderr)
+
+def _analyze_images(image_paths: List[str]) -> List[Tuple[Dict, Optional[Dict], Optional[str]]]:
+    """_analyze_one_image over a claim, in processes for large claims and threads otherwise"""
+    # Images are independent: decode/numpy/PIL release the GIL, so threads
+    # suffice for small claims; large claims get one process per core
+    if len(image_paths) > PROCESS_POOL_MIN_IMAGES and (os.cpu_count() or 1) > 1:
+        pool = _get_process_pool()
+        if pool is not None:
+            try:
+                return list(pool.map(_analyze_one_image, image_paths))
+            except (BrokenProcessPool, OSError) as e:
+                _discard_process_pool(e)
+    
+    with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as ex:
+        return list(ex.map(_analyze_one_image, image_paths))
 
 
 # ============================================================================
@@ -197,45 +481,52 @@ def assess_crop_damage(
 
     # 1. Analyze Images & Extract Metadata
     results = []
-    coordinates = []
+    lats, lons = [], []
     damage_percentages = []
     damage_types = []
-    image_details_for_fraud = []
+    # Fraud-check inputs as parallel columns (one list per field)
+    fraud_filenames, fraud_timestamps = [], []
+    
+    per_image = _analyze_images(image_paths)
     
-    for path in image_paths:
-        if not os.path.exists(path):
+    valid_indices = []
+    for path, (indices, coords, ts) in zip(image_paths, per_image):
+        if 'error' in indices:
             continue
-        
-        # Analyze damage
-        analysis = analyze_damage_rgb(path)
-        if 'error' not in analysis:
-            results.append(analysis)
-            damage_percentages.append(analysis['damage_percentage'])
-            damage_types.append(analysis['damage_type_code'])
+        valid_indices.append(indices)
         
         # Extract metadata
-        coords = get_exif_coordinates(path)
         if coords:
-            coordinates.append(coords)
+            lats.append(coords['lat'])
+            lons.append(coords['lon'])
             
-        ts = get_exif_timestamp(path)
-        image_details_for_fraud.append({
-            'filename': os.path.basename(path),
-            'exif_timestamp': ts,
-            'software': '' # Can extract software tag if needed
-        })
+        fraud_filenames.append(os.path.basename(path))
+        fraud_timestamps.append(ts)
     
-    if not results:
+    if not valid_indices:
         return {'error': 'No valid images could be processed'}
+    
+    # Classify all images in one vectorized call
+    codes = classify_batch([ind['avg_exg'] for ind in valid_indices],
+                           [ind['avg_exr'] for ind in valid_indices])
+    for indices, code in zip(valid_indices, codes.tolist()):
+        analysis = _format_analysis(indices, code)
+        results.append(analysis)
+        damage_percentages.append(analysis['damage_percentage'])
+        damage_types.append(DAMAGE_CLASS_INDEX[code])
 
     # 2. Geolocation Verification
-    geo_result = geo_verifier.analyze_coordinate_cluster(coordinates)
+    coords_arr = np.stack([lats, lons], axis=1) # (N, 2) [lat, lon]
+    geo_result = geo_verifier.analyze_coordinate_cluster(coords_arr)
+    # The verifier returns raw spreads; the report carries them to 10 m
+    for key in ('max_spread_km', 'avg_spread_km'):
+        if key in geo_result:
+            geo_result[key] = round(geo_result[key], 2)
     
     # 3. Damage Assessment
     avg_damage = np.mean(damage_percentages)
-    from collections import Counter
-    damage_type_code = Counter(damage_types).most_common(1)[0][0]
-    damage_type_name = CONFIG.get('DAMAGE_NAMES', {}).get(damage_type_code, 'Unknown')
+    damage_type_code = DAMAGE_CLASSES[majority_class(damage_types, len(DAMAGE_CLASSES))]
+    damage_type_name = DAMAGE_NAMES.get(damage_type_code, 'Unknown')
     
     # 4. Weather Verification
     # Use center of image coordinates or user coordinates
@@ -250,6 +541,11 @@ def assess_crop_damage(
 
     # 5. Fraud Detection
     # TODO: Pass Exif software data
+    image_details_for_fraud = {
+        'filename': fraud_filenames,
+        'exif_timestamp': fraud_timestamps,
+        'software': [''] * len(fraud_filenames)  # Can extract software tag if needed
+    }
     exif_fraud_result = fraud_detector.verify_exif_timestamps(image_details_for_fraud, datetime.now())
     
     # 6. Final Fraud Risk Calculation
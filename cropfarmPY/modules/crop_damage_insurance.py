@@ -14,29 +14,89 @@ Output:
 """
 
 import os
+import sys
 import gc
+import threading
 import json
 import pickle
 from datetime import datetime
-from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Tuple, Optional
 
+from dataclasses import dataclass
+from functools import lru_cache, cached_property
+
 import numpy as np
 import cv2
-from PIL import Image
-
-import torch
-import torch.nn as nn
-import torch.nn.functional as F
-from torchvision import transforms
-import timm
 
 try:
-    from skimage.metrics import structural_similarity as ssim
+    import numba
+    from numba import njit, prange
+    # TBB hangs at interpreter exit once a kernel has run on a worker thread
+    if 'NUMBA_THREADING_LAYER_PRIORITY' not in os.environ:
+        numba.config.THREADING_LAYER_PRIORITY = ['omp', 'workqueue', 'tbb']
+    NUMBA_AVAILABLE = True
 except ImportError:
-    # Fallback if skimage not installed
-    def ssim(img1, img2):
-        return float(np.corrcoef(img1.flatten(), img2.flatten())[0, 1])
+    NUMBA_AVAILABLE = False
+
+# torch/torchvision/timm/PIL are imported where they are used, so
+# RGBDamageAnalyzer (pure NumPy/OpenCV) can be imported without them.
+
+
+# SSIM with scikit-image's defaults (7x7 uniform window, sample covariance,
+# uint8 data range), built from OpenCV box filters
+_SSIM_WIN = 7
+_SSIM_COV_NORM = _SSIM_WIN ** 2 / (_SSIM_WIN ** 2 - 1)
+_SSIM_C1 = (0.01 * 255) ** 2
+_SSIM_C2 = (0.03 * 255) ** 2
+
+
+def _ssim_stats(gray: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Per-image SSIM terms (image, local mean, local variance), reusable across pairs"""
+    x = gray.astype(np.float64)
+    mu = cv2.blur(x, (_SSIM_WIN, _SSIM_WIN))
+    var = cv2.blur(x * x, (_SSIM_WIN, _SSIM_WIN))
+    var -= mu * mu
+    var *= _SSIM_COV_NORM
+    return x, mu, var
+
+
+def _ssim(stats1: Tuple, stats2: Tuple) -> float:
+    """Mean SSIM of two images from their _ssim_stats"""
+    x, mu_x, var_x = stats1
+    y, mu_y, var_y = stats2
+    cov = cv2.blur(x * y, (_SSIM_WIN, _SSIM_WIN))
+    cov -= mu_x * mu_y
+    cov *= _SSIM_COV_NORM
+    
+    ssim_map = ((2 * mu_x * mu_y + _SSIM_C1) * (2 * cov + _SSIM_C2)) / \
+               ((mu_x * mu_x + mu_y * mu_y + _SSIM_C1) * (var_x + var_y + _SSIM_C2))
+    pad = (_SSIM_WIN - 1) // 2
+    return float(ssim_map[pad:-pad, pad:-pad].mean())
+
+
+def _ssim_pairs_torch(grays: List[np.ndarray], i_idx: np.ndarray, j_idx: np.ndarray,
+                      device: 'torch.device') -> np.ndarray:
+    """
+    Same SSIM as _ssim for many (i, j) pairs in one batched torch call.
+    avg_pool2d without padding yields exactly the border-cropped window means.
+    """
+    import torch
+    import torch.nn.functional as F
+    
+    with torch.inference_mode():
+        x = torch.from_numpy(np.stack(grays)).to(device).float().unsqueeze(1)   # (N, 1, H, W)
+        mu = F.avg_pool2d(x, _SSIM_WIN, stride=1)
+        var = (F.avg_pool2d(x * x, _SSIM_WIN, stride=1) - mu * mu) * _SSIM_COV_NORM
+        
+        i_t = torch.from_numpy(i_idx).to(device)
+        j_t = torch.from_numpy(j_idx).to(device)
+        mu_x, mu_y = mu[i_t], mu[j_t]
+        cov = (F.avg_pool2d(x[i_t] * x[j_t], _SSIM_WIN, stride=1) - mu_x * mu_y) * _SSIM_COV_NORM
+        
+        ssim_map = ((2 * mu_x * mu_y + _SSIM_C1) * (2 * cov + _SSIM_C2)) / \
+                   ((mu_x * mu_x + mu_y * mu_y + _SSIM_C1) * (var[i_t] + var[j_t] + _SSIM_C2))
+        return ssim_map.mean(dim=(1, 2, 3)).double().cpu().numpy()
 
 
 # ============================================================================
@@ -64,47 +124,221 @@ class Config:
     
     # Overlap detection
     OVERLAP_SSIM_THRESHOLD = 0.6
+    
+    # Classifier compilation / CUDA graph capture (CUDA only). Batches are
+    # padded to STATIC_BATCH_SIZE (max images per claim) so one graph serves
+    # every claim size; larger batches run in chunks.
+    COMPILE_CLASSIFIER = True
+    USE_CUDA_GRAPHS = True
+    STATIC_BATCH_SIZE = 10
+    # TensorRT FP16 engine for the static batch shape (needs torch_tensorrt);
+    # built once and cached next to the model weights, preferred over compile
+    USE_TENSORRT = True
+    
+    # Threads for per-image decode/RGB analysis/preprocessing
+    PREPROCESS_WORKERS = 8
+
+
+_CLASS_TO_IDX = {c: i for i, c in enumerate(Config.DAMAGE_CLASSES)}
+_ACRES_PER_M2 = 1 / 4046.86
+
+
+def majority_class(votes: List[int], n_classes: int) -> int:
+    """Most frequent class index; ties go to the class seen first, as with Counter.most_common"""
+    votes = np.asarray(votes)
+    counts = np.bincount(votes, minlength=n_classes)
+    classes, first_seen = np.unique(votes, return_index=True)
+    tied = counts[classes] == counts.max()
+    return int(classes[tied][first_seen[tied].argmin()])
+
+
+# ============================================================================
+# IMAGE LOADING
+# ============================================================================
+@dataclass
+class ImageBundle:
+    """One decode per claim image, shared by RGB analysis, classifier and overlap detection"""
+    
+    path: str
+    bgr: np.ndarray
+    
+    @classmethod
+    def load(cls, path: str) -> Optional['ImageBundle']:
+        img = cv2.imread(path)
+        return cls(path, img) if img is not None else None
+    
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self.bgr.shape[:2]
+    
+    @cached_property
+    def rgb(self) -> np.ndarray:
+        return cv2.cvtColor(self.bgr, cv2.COLOR_BGR2RGB)
+    
+    @cached_property
+    def pil(self) -> 'Image.Image':
+        """
+        Classifier input as Image.open(path).convert('RGB') would give it.
+        PIL ignores the EXIF Orientation tag that cv2.imread applies, so
+        rotated/flipped photos are decoded again without it.
+        """
+        from PIL import Image
+        rgb = self.rgb
+        if _exif_orientation(self.path) not in (None, 1):
+            raw = cv2.imread(self.path, cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION)
+            if raw is not None:
+                rgb = cv2.cvtColor(raw, cv2.COLOR_BGR2RGB)
+        return Image.fromarray(rgb)
+    
+    @cached_property
+    def overlap_thumb(self) -> np.ndarray:
+        """256x256 RGB thumbnail used for overlap detection"""
+        return cv2.resize(self.rgb, (256, 256))
+
+
+def _exif_orientation(path: str) -> Optional[int]:
+    """EXIF Orientation tag (1-8) from the file header, or None"""
+    try:
+        from PIL import Image
+        with Image.open(path) as header:
+            return header.getexif().get(0x0112)
+    except Exception:
+        return None
+
+
+def _load_overlap_thumb(path: str) -> Optional[np.ndarray]:
+    """
+    256x256 RGB thumbnail straight from disk, decoding at the coarsest JPEG
+    DCT scale (1/2, 1/4, 1/8) that still leaves both sides >= 256 px.
+    """
+    flag = cv2.IMREAD_COLOR
+    try:
+        from PIL import Image
+        with Image.open(path) as header:
+            short_side = min(header.size)
+        for factor, reduced_flag in ((8, cv2.IMREAD_REDUCED_COLOR_8),
+                                     (4, cv2.IMREAD_REDUCED_COLOR_4),
+                                     (2, cv2.IMREAD_REDUCED_COLOR_2)):
+            if short_side // factor >= 256:
+                flag = reduced_flag
+                break
+    except Exception:
+        pass
+    
+    img = cv2.imread(path, flag)
+    if img is None:
+        return None
+    return cv2.resize(cv2.cvtColor(img, cv2.COLOR_BGR2RGB), (256, 256))
 
 
 # ============================================================================
 # RGB DAMAGE ANALYZER
 # ============================================================================
+# Numba's parallel runtime must not be entered from several threads at once;
+# analyze_field runs images on a thread pool and the kernel uses all cores.
+_KERNEL_LOCK = threading.Lock()
+
+if NUMBA_AVAILABLE:
+    def _damage_stats(bgr):
+        """
+        Single-pass get_damage_mask over a BGR uint8 image.
+        Returns (damage_pct, exg_mean).
+        """
+        h, w = bgr.shape[0], bgr.shape[1]
+        row_exg = np.zeros(h, dtype=np.float64)
+        row_damage = np.zeros(h, dtype=np.int64)
+
+        for y in prange(h):
+            sum_exg = 0.0
+            damage_count = 0
+            for x in range(w):
+                b = np.float32(bgr[y, x, 0])
+                g = np.float32(bgr[y, x, 1])
+                r = np.float32(bgr[y, x, 2])
+                total = r + g + b + np.float32(1e-6)
+                # Same float32 operation order as normalize_channels/calculate_*
+                # (no fastmath), so the mask matches the NumPy path exactly.
+                # In RGB channel order ExR uses channel 2, i.e. BGR channel 0.
+                nb = b / total
+                ng = g / total
+                nr = r / total
+                exg = np.float32(2) * ng - nb - nr
+                exr = np.float32(1.4) * nb - ng
+                gray = np.float32(0.114) * b + np.float32(0.587) * g + np.float32(0.299) * r
+
+                sum_exg += exg
+                # Gray bounds match cv2's rounded uint8 gray: 80 < gray < 180
+                if exr > 0.1 or (gray >= 80.5 and gray < 179.5 and not exg > 0.05):
+                    damage_count += 1
+
+            row_exg[y] = sum_exg
+            row_damage[y] = damage_count
+
+        n_pixels = h * w
+        return 100.0 * row_damage.sum() / n_pixels, row_exg.sum() / n_pixels
+
+    # Explicit signature: compiled at import (cached on disk), not on the first claim
+    try:
+        _damage_stats = njit('UniTuple(float64, 2)(uint8[:, :, ::1])', parallel=True, cache=True)(_damage_stats)
+    except ImportError:
+        # The disk cache was written with this file imported under another
+        # module name (e.g. bare vs modules.crop_damage_insurance); compile fresh
+        _damage_stats = njit('UniTuple(float64, 2)(uint8[:, :, ::1])', parallel=True)(_damage_stats)
+
+
 class RGBDamageAnalyzer:
     """Physics-based damage detection using RGB indices"""
     
     @staticmethod
-    def calculate_exg(img_rgb: np.ndarray) -> np.ndarray:
+    def normalize_channels(img_rgb: np.ndarray) -> np.ndarray:
+        """Each channel divided by the per-pixel channel sum, in one HxWx3 buffer"""
+        img_f = img_rgb.astype(np.float32)
+        # Channel views of the single float cast; adding them avoids the slow
+        # strided axis=2 reduction (same result: ((c0 + c1) + c2))
+        total = np.add(img_f[..., 0], img_f[..., 1])
+        total += img_f[..., 2]
+        total += 1e-6
+        return np.divide(img_f, total[..., None], out=img_f)
+    
+    @staticmethod
+    def calculate_exg(img_rgb: np.ndarray, norm: Optional[np.ndarray] = None) -> np.ndarray:
         """Excess Green Index"""
-        b, g, r = cv2.split(img_rgb.astype(np.float32))
-        total = r + g + b + 1e-6
-        return 2 * (g / total) - (r / total) - (b / total)
+        if norm is None:
+            norm = RGBDamageAnalyzer.normalize_channels(img_rgb)
+        exg = np.multiply(norm[..., 1], 2)
+        exg -= norm[..., 2]
+        exg -= norm[..., 0]
+        return exg
     
     @staticmethod
-    def calculate_exr(img_rgb: np.ndarray) -> np.ndarray:
+    def calculate_exr(img_rgb: np.ndarray, norm: Optional[np.ndarray] = None) -> np.ndarray:
         """Excess Red Index"""
-        b, g, r = cv2.split(img_rgb.astype(np.float32))
-        total = r + g + b + 1e-6
-        return 1.4 * (r / total) - (g / total)
+        if norm is None:
+            norm = RGBDamageAnalyzer.normalize_channels(img_rgb)
+        exr = np.multiply(norm[..., 2], 1.4, dtype=np.float32)
+        exr -= norm[..., 1]
+        return exr
     
     @staticmethod
     def detect_soil(img_rgb: np.ndarray) -> np.ndarray:
         """Detect bare soil"""
         gray = cv2.cvtColor(img_rgb, cv2.COLOR_RGB2GRAY)
-        return ((gray > 80) & (gray < 180)).astype(np.float32)
+        return cv2.inRange(gray, 81, 179).astype(bool)
     
     @staticmethod
-    def get_damage_mask(img_rgb: np.ndarray) -> Tuple[np.ndarray, float]:
-        """Combined damage detection"""
-        exg = RGBDamageAnalyzer.calculate_exg(img_rgb)
-        exr = RGBDamageAnalyzer.calculate_exr(img_rgb)
+    def get_damage_mask(img_rgb: np.ndarray) -> Tuple[np.ndarray, float, float]:
+        """Combined damage detection: (damage mask, damage %, mean ExG)"""
+        norm = RGBDamageAnalyzer.normalize_channels(img_rgb)
+        exg = RGBDamageAnalyzer.calculate_exg(img_rgb, norm)
+        exr = RGBDamageAnalyzer.calculate_exr(img_rgb, norm)
         soil = RGBDamageAnalyzer.detect_soil(img_rgb)
         
-        healthy_mask = (exg > 0.05).astype(np.float32)
-        stress_mask = (exr > 0.1).astype(np.float32)
-        damage_mask = np.clip(stress_mask + soil * (1 - healthy_mask), 0, 1)
-        damage_pct = float(np.mean(damage_mask) * 100)
+        healthy_mask = exg > 0.05
+        stress_mask = exr > 0.1
+        damage_mask = stress_mask | (soil & ~healthy_mask)
+        damage_pct = 100.0 * cv2.countNonZero(damage_mask.view(np.uint8)) / damage_mask.size
         
-        return damage_mask, damage_pct
+        return damage_mask, damage_pct, float(np.mean(exg))
     
     @staticmethod
     def analyze_single_image(img_path: str) -> Dict:
@@ -112,13 +346,21 @@ class RGBDamageAnalyzer:
         img = cv2.imread(img_path)
         if img is None:
             return {'error': 'Could not load image'}
-        
-        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        mask, damage_pct = RGBDamageAnalyzer.get_damage_mask(img_rgb)
+        return RGBDamageAnalyzer.analyze_bgr(img)
+    
+    @staticmethod
+    def analyze_bgr(img: np.ndarray) -> Dict:
+        """Analyze an already-decoded BGR image"""
+        if NUMBA_AVAILABLE:
+            with _KERNEL_LOCK:
+                damage_pct, exg_mean = _damage_stats(np.ascontiguousarray(img))
+        else:
+            img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+            mask, damage_pct, exg_mean = RGBDamageAnalyzer.get_damage_mask(img_rgb)
         
         return {
             'damage_percentage': damage_pct,
-            'vegetation_index': float(np.mean(RGBDamageAnalyzer.calculate_exg(img_rgb))),
+            'vegetation_index': exg_mean,
             'image_size': img.shape[:2]
         }
 
@@ -126,29 +368,45 @@ class RGBDamageAnalyzer:
 # ============================================================================
 # CLASSIFIER MODEL
 # ============================================================================
-class CropDamageClassifier(nn.Module):
-    """EfficientNet-based damage classifier"""
+@lru_cache(maxsize=None)
+def _classifier_class():
+    """Define CropDamageClassifier on first use (torch/timm are heavy imports)"""
+    import torch
+    import torch.nn as nn
+    import timm
     
-    def __init__(self, backbone=Config.BACKBONE, num_classes=Config.NUM_CLASSES):
-        super().__init__()
-        self.backbone = timm.create_model(
-            backbone, pretrained=False, num_classes=0, global_pool='avg'
-        )
+    class CropDamageClassifier(nn.Module):
+        """EfficientNet-based damage classifier"""
         
-        with torch.no_grad():
-            dummy = torch.randn(1, 3, Config.IMG_SIZE, Config.IMG_SIZE)
-            feat_dim = self.backbone(dummy).shape[1]
+        def __init__(self, backbone=Config.BACKBONE, num_classes=Config.NUM_CLASSES):
+            super().__init__()
+            self.backbone = timm.create_model(
+                backbone, pretrained=False, num_classes=0, global_pool='avg'
+            )
+            
+            with torch.no_grad():
+                dummy = torch.randn(1, 3, Config.IMG_SIZE, Config.IMG_SIZE)
+                feat_dim = self.backbone(dummy).shape[1]
+            
+            self.classifier = nn.Sequential(
+                nn.Dropout(0.3),
+                nn.Linear(feat_dim, 256),
+                nn.ReLU(),
+                nn.Dropout(0.2),
+                nn.Linear(256, num_classes)
+            )
         
-        self.classifier = nn.Sequential(
-            nn.Dropout(0.3),
-            nn.Linear(feat_dim, 256),
-            nn.ReLU(),
-            nn.Dropout(0.2),
-            nn.Linear(256, num_classes)
-        )
+        def forward(self, x):
+            return self.classifier(self.backbone(x))
     
-    def forward(self, x):
-        return self.classifier(self.backbone(x))
+    return CropDamageClassifier
+
+
+def __getattr__(name):
+    # Keeps `from crop_damage_insurance import CropDamageClassifier` working
+    if name == 'CropDamageClassifier':
+        return _classifier_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ============================================================================
@@ -158,30 +416,157 @@ class InsuranceFieldAnalyzer:
     """Main insurance assessment class"""
     
     def __init__(self, model_path: str = None, device: str = 'cuda'):
+        import torch
         self.device = torch.device(device if torch.cuda.is_available() else 'cpu')
         self.rgb_analyzer = RGBDamageAnalyzer()
         self.classifier = None
+        self._cuda_graph = None
+        self._tensorrt = False
+        # Analyzers are shared across claims (get_analyzer); the static CUDA
+        # graph buffers must not be used by two forwards at once
+        self._infer_lock = threading.Lock()
+        
+        # ImageNet normalization as (3, 1, 1) tensors, built once
+        self._norm_mean = torch.tensor([0.485, 0.456, 0.406]).view(3, 1, 1)
+        self._norm_std = torch.tensor([0.229, 0.224, 0.225]).view(3, 1, 1)
+        self._norm_mean_dev = self._norm_mean.to(self.device)
+        self._norm_std_dev = self._norm_std.to(self.device)
+        # Host->device copies run here so they overlap classifier compute
+        self._copy_stream = torch.cuda.Stream(self.device) if self.device.type == 'cuda' else None
         
         if model_path and os.path.exists(model_path):
             self.load_classifier(model_path)
     
     def load_classifier(self, model_path: str):
         """Load trained model"""
-        self.classifier = CropDamageClassifier().to(self.device)
+        import torch
+        self.classifier = _classifier_class()().to(self.device)
         self.classifier.load_state_dict(
             torch.load(model_path, map_location=self.device)
         )
         self.classifier.eval()
+        if self.device.type == 'cuda':
+            # NHWC is the native layout for Tensor Core convolutions
+            self.classifier = self.classifier.to(memory_format=torch.channels_last)
+        
+        self._cuda_graph = None
+        self._tensorrt = False
+        if self.device.type != 'cuda':
+            return
+        
+        if Config.USE_TENSORRT and self._load_tensorrt(model_path):
+            return
+        
+        # TorchInductor + CUDA graphs; on CPU compile time outweighs the gain
+        compiled = False
+        if Config.COMPILE_CLASSIFIER and hasattr(torch, 'compile'):
+            try:
+                eager = self.classifier
+                self.classifier = torch.compile(eager, mode='reduce-overhead', fullgraph=False)
+                self._predict_proba(torch.zeros(Config.STATIC_BATCH_SIZE, 3,
+                                                Config.IMG_SIZE, Config.IMG_SIZE))
+                compiled = True
+            except Exception as e:
+                self.classifier = eager
+                print(f"[WARNING] torch.compile failed, using eager classifier: {e}", file=sys.stderr)
+        
+        # Without compile, capture the eager forward in a CUDA graph ourselves
+        if not compiled and Config.USE_CUDA_GRAPHS:
+            try:
+                self._capture_cuda_graph()
+            except Exception as e:
+                self._cuda_graph = None
+                print(f"[WARNING] CUDA graph capture failed, using eager launches: {e}", file=sys.stderr)
     
-    def preprocess_image(self, img_path: str) -> torch.Tensor:
+    def _load_tensorrt(self, model_path: str) -> bool:
+        """
+        Swap the classifier for a TensorRT FP16 engine over the fixed
+        (STATIC_BATCH_SIZE, 3, IMG_SIZE, IMG_SIZE) input. The serialized engine is
+        keyed on the weights file, image size and batch size, so it is only
+        rebuilt when one of them changes. Returns False if TensorRT is unavailable.
+        """
+        try:
+            import torch_tensorrt
+        except ImportError:
+            return False
+        import torch
+        
+        shape = (Config.STATIC_BATCH_SIZE, 3, Config.IMG_SIZE, Config.IMG_SIZE)
+        stat = os.stat(model_path)
+        engine_path = (f"{model_path}.trt_{Config.IMG_SIZE}x{Config.STATIC_BATCH_SIZE}"
+                       f"_{stat.st_size}_{stat.st_mtime_ns}.ts")
+        try:
+            if os.path.exists(engine_path):
+                engine = torch.jit.load(engine_path, map_location=self.device)
+            else:
+                with torch.no_grad():
+                    traced = torch.jit.trace(self.classifier, torch.zeros(shape, device=self.device))
+                engine = torch_tensorrt.compile(
+                    traced,
+                    inputs=[torch_tensorrt.Input(shape, dtype=torch.half)],
+                    enabled_precisions={torch.half}
+                )
+                try:
+                    torch.jit.save(engine, engine_path)
+                except OSError as e:
+                    print(f"[WARNING] Could not cache TensorRT engine: {e}", file=sys.stderr)
+        except Exception as e:
+            print(f"[WARNING] TensorRT build failed, falling back: {e}", file=sys.stderr)
+            return False
+        
+        self.classifier = engine
+        self._tensorrt = True
+        return True
+    
+    def _capture_cuda_graph(self):
+        """Record one fixed-shape FP16 forward; replays skip per-kernel launch overhead"""
+        import torch
+        static_in = torch.zeros(Config.STATIC_BATCH_SIZE, 3, Config.IMG_SIZE, Config.IMG_SIZE,
+                                device=self.device).to(memory_format=torch.channels_last)
+        
+        # Autocast's weight cache must be off while capturing
+        with torch.inference_mode(), torch.autocast(device_type='cuda', dtype=torch.float16,
+                                                    cache_enabled=False):
+            # Warm up on a side stream (cuDNN autotuning, lazy init) before capture
+            side = torch.cuda.Stream()
+            side.wait_stream(torch.cuda.current_stream())
+            with torch.cuda.stream(side):
+                for _ in range(3):
+                    self.classifier(static_in)
+            torch.cuda.current_stream().wait_stream(side)
+            
+            graph = torch.cuda.CUDAGraph()
+            with torch.cuda.graph(graph):
+                static_out = self.classifier(static_in)
+        
+        self._cuda_graph = (graph, static_in, static_out)
+    
+    def preprocess_image(self, img_path: str) -> 'torch.Tensor':
         """Preprocess for classifier"""
-        transform = transforms.Compose([
-            transforms.Resize((Config.IMG_SIZE, Config.IMG_SIZE)),
-            transforms.ToTensor(),
-            transforms.Normalize([0.485, 0.456, 0.406], [0.229, 0.224, 0.225])
-        ])
-        img = Image.open(img_path).convert('RGB')
-        return transform(img).unsqueeze(0)
+        from PIL import Image
+        return self._preprocess_chw(Image.open(img_path).convert('RGB')).unsqueeze(0)
+    
+    def _preprocess_chw(self, img: 'Image.Image') -> 'torch.Tensor':
+        """Normalized CHW classifier tensor (no batch dim) for an RGB PIL image"""
+        # Resize -> ToTensor -> Normalize, without per-call transform objects
+        tensor = self._resize_uint8(img).permute(2, 0, 1).float()
+        return tensor.div_(255).sub_(self._norm_mean).div_(self._norm_std)
+    
+    @staticmethod
+    def _resize_uint8(img: 'Image.Image') -> 'torch.Tensor':
+        """Classifier-sized HWC uint8 tensor (what transforms.Resize would produce)"""
+        import torch
+        from PIL import Image
+        resized = img.resize((Config.IMG_SIZE, Config.IMG_SIZE), Image.BILINEAR)
+        return torch.from_numpy(np.asarray(resized).copy())
+    
+    def _normalize_on_device(self, batch: 'torch.Tensor') -> 'torch.Tensor':
+        """
+        (N, H, W, 3) uint8 batch -> normalized (N, 3, H, W) float on device.
+        Only uint8 crosses PCIe; the NHWC permute is already channels_last.
+        """
+        batch = batch.to(self.device, non_blocking=True).permute(0, 3, 1, 2).float()
+        return batch.div_(255).sub_(self._norm_mean_dev).div_(self._norm_std_dev)
     
     def calculate_image_similarity(self, img1: np.ndarray, img2: np.ndarray) -> float:
         """SSIM for overlap detection"""
@@ -190,29 +575,40 @@ class InsuranceFieldAnalyzer:
         img2_resized = cv2.resize(img2, size)
         gray1 = cv2.cvtColor(img1_resized, cv2.COLOR_RGB2GRAY)
         gray2 = cv2.cvtColor(img2_resized, cv2.COLOR_RGB2GRAY)
-        return ssim(gray1, gray2)
+        return _ssim(_ssim_stats(gray1), _ssim_stats(gray2))
     
-    def detect_overlaps(self, image_paths: List[str]) -> Tuple[float, int]:
-        """Detect overlapping images"""
+    def detect_overlaps(self, image_paths: List[str],
+                        thumbnails: Optional[List[np.ndarray]] = None) -> Tuple[float, int]:
+        """Detect overlapping images (pass ImageBundle.overlap_thumb's to skip decoding)"""
         if len(image_paths) <= 1:
             return 0.0, len(image_paths)
         
-        images = []
-        for path in image_paths:
-            img = cv2.imread(path)
-            if img is not None:
-                images.append(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+        if thumbnails is not None:
+            images = thumbnails
+        else:
+            images = []
+            for path in image_paths:
+                thumb = _load_overlap_thumb(path)
+                if thumb is not None:
+                    images.append(thumb)
         
         if len(images) <= 1:
             return 0.0, len(images)
         
-        similarities = []
-        for i in range(len(images)):
-            for j in range(i + 1, len(images)):
-                sim = self.calculate_image_similarity(images[i], images[j])
-                similarities.append(sim)
+        # One resize + gray conversion per image, shared by every pair
+        grays = [cv2.cvtColor(cv2.resize(img, (256, 256)), cv2.COLOR_RGB2GRAY) for img in images]
+        i_idx, j_idx = np.triu_indices(len(images), k=1)
+        
+        if self.device.type == 'cuda':
+            # All pairs in one batched GPU call
+            similarities = _ssim_pairs_torch(grays, i_idx, j_idx, self.device)
+        else:
+            # CPU: per-image SSIM terms are computed once and reused across pairs
+            ssim_stats = [_ssim_stats(gray) for gray in grays]
+            similarities = np.array([_ssim(ssim_stats[i], ssim_stats[j])
+                                     for i, j in zip(i_idx, j_idx)])
         
-        avg_sim = np.mean(similarities) if similarities else 0.0
+        avg_sim = float(np.mean(similarities))
         overlap_factor = max(0.5, 1 - avg_sim)
         effective_count = max(1, int(len(images) * overlap_factor))
         
@@ -221,14 +617,142 @@ class InsuranceFieldAnalyzer:
     def classify_damage_type(self, img_path: str) -> Dict:
         """Classify damage type"""
         if self.classifier is None:
-            return {'damage_type': 'unknown', 'confidence': 0.0, 'probabilities': {}}
+            return self._unknown_classification()
+        
+        probs = self._predict_proba(self.preprocess_image(img_path))[0]
+        return self._format_classification(probs)
+    
+    def classify_damage_batch(self, img_paths: List[str]) -> List[Dict]:
+        """Classify damage type for many images in one forward pass"""
+        if self.classifier is None or not img_paths:
+            return [self._unknown_classification() for _ in img_paths]
+        
+        from PIL import Image
+        return self.classify_damage_tensors([self._preprocess_chw(Image.open(p).convert('RGB'))
+                                             for p in img_paths])
+    
+    def classify_damage_tensors(self, tensors: List['torch.Tensor']) -> List[Dict]:
+        """
+        Classify already-preprocessed images in one forward pass: normalized CHW
+        float tensors, or HWC uint8 tensors from _resize_uint8 (normalized on device)
+        """
+        if self.classifier is None or not tensors:
+            return [self._unknown_classification() for _ in tensors]
+        
+        import torch
+        
+        batch = torch.stack(tensors)
+        if self.device.type == 'cuda':
+            batch = batch.pin_memory()
+        probs = self._predict_proba(batch)
+        
+        return [self._format_classification(p) for p in probs]
+    
+    def _predict_proba(self, batch: 'torch.Tensor') -> np.ndarray:
+        """Softmax class probabilities for an (N, 3, H, W) float or (N, H, W, 3) uint8 host batch"""
+        import torch
+        import torch.nn.functional as F
+        
+        if self.device.type == 'cuda':
+            return self._predict_proba_cuda(batch)
+        
+        if batch.dtype == torch.uint8:
+            batch = self._normalize_on_device(batch)
+        batch = batch.to(self.device)
+        with torch.inference_mode():
+            outputs = self.classifier(batch)
+        
+        return F.softmax(outputs.float(), dim=1).cpu().numpy()
+    
+    def _predict_proba_cuda(self, batch: 'torch.Tensor') -> np.ndarray:
+        """
+        CUDA path of _predict_proba. Fixed-shape chunks so the compiled/captured
+        graph is replayed for every claim size (padding rows are dropped); each
+        chunk's H2D copy is queued on the copy stream, so it overlaps the
+        forward of the chunk before it.
+        """
+        import torch
+        import torch.nn.functional as F
+        
+        compute = torch.cuda.current_stream(self.device)
+        size = Config.STATIC_BATCH_SIZE
+        staged = []
+        with torch.cuda.stream(self._copy_stream):
+            for start in range(0, len(batch), size):
+                chunk = batch[start:start + size].to(self.device, non_blocking=True)
+                copied = torch.cuda.Event()
+                copied.record(self._copy_stream)
+                staged.append((chunk, copied))
         
-        img_tensor = self.preprocess_image(img_path).to(self.device)
+        logits = []
+        with self._infer_lock:
+            for chunk, copied in staged:
+                compute.wait_event(copied)
+                # Allocated on the copy stream, consumed on the compute stream
+                chunk.record_stream(compute)
+                if chunk.dtype == torch.uint8:
+                    chunk = self._normalize_on_device(chunk)
+                logits.append(self._forward_static(chunk)[:len(chunk)].float())
+        
+        # Async D2H into pinned memory; wait only right before NumPy reads it
+        probs = F.softmax(torch.cat(logits), dim=1)
+        host = torch.empty(probs.shape, dtype=probs.dtype, pin_memory=True)
+        host.copy_(probs, non_blocking=True)
+        done = torch.cuda.Event()
+        done.record(compute)
+        done.synchronize()
+        return host.numpy()
+    
+    def _forward_static(self, chunk: 'torch.Tensor') -> 'torch.Tensor':
+        """Logits for a STATIC_BATCH_SIZE-padded chunk (CUDA only)"""
+        import torch
         
-        with torch.no_grad():
-            outputs = self.classifier(img_tensor)
-            probs = F.softmax(outputs, dim=1).cpu().numpy()[0]
+        if self._cuda_graph is not None:
+            graph, static_in, static_out = self._cuda_graph
+            static_in[:len(chunk)].copy_(chunk, non_blocking=True)
+            graph.replay()
+            return static_out
         
+        if self._tensorrt:
+            # The engine takes contiguous FP16 input and runs its own kernels
+            padded = torch.zeros(Config.STATIC_BATCH_SIZE, 3, Config.IMG_SIZE, Config.IMG_SIZE,
+                                 dtype=torch.half, device=self.device)
+            padded[:len(chunk)].copy_(chunk, non_blocking=True)
+            with torch.inference_mode():
+                return self.classifier(padded)
+        
+        # FP16 Tensor Core convs on channels_last input
+        padded = torch.zeros(Config.STATIC_BATCH_SIZE, 3, Config.IMG_SIZE, Config.IMG_SIZE,
+                             device=self.device).to(memory_format=torch.channels_last)
+        padded[:len(chunk)].copy_(chunk, non_blocking=True)
+        with torch.inference_mode(), torch.autocast(device_type='cuda', dtype=torch.float16):
+            return self.classifier(padded)
+    
+    def _prepare_image(self, img_path: str) -> Tuple[Dict, Optional['torch.Tensor'], Optional[np.ndarray]]:
+        """
+        Decode once, then RGB analysis + classifier tensor + overlap thumbnail
+        for one image (runs on a worker thread)
+        """
+        bundle = ImageBundle.load(img_path)
+        if bundle is None:
+            return {'error': 'Could not load image'}, None, None
+        
+        rgb_result = self.rgb_analyzer.analyze_bgr(bundle.bgr)
+        tensor = None
+        if self.classifier is not None:
+            # On CUDA only the resize happens here; normalization runs on the GPU
+            tensor = (self._resize_uint8(bundle.pil) if self.device.type == 'cuda'
+                      else self._preprocess_chw(bundle.pil))
+        return rgb_result, tensor, bundle.overlap_thumb
+    
+    @staticmethod
+    def _unknown_classification() -> Dict:
+        """Result when no classifier is loaded"""
+        return {'damage_type': 'unknown', 'confidence': 0.0, 'probabilities': {}}
+    
+    @staticmethod
+    def _format_classification(probs: np.ndarray) -> Dict:
+        """Result dict from one image's class probabilities"""
         pred_idx = np.argmax(probs)
         
         return {
@@ -249,13 +773,15 @@ class InsuranceFieldAnalyzer:
         return "HIGH" if score >= 7 else ("MEDIUM" if score >= 5 else "LOW")
     
     def analyze_field(self, image_paths: List[str],
-                      manual_field_area_m2: Optional[float] = None) -> Dict:
+                      manual_field_area_m2: Optional[float] = None,
+                      include_image_details: bool = False) -> Dict:
         """
         🔥 MAIN FUNCTION - Insurance-grade field assessment
         
         Args:
             image_paths: List of 4-10 image paths
             manual_field_area_m2: Optional known field size
+            include_image_details: Attach the per-image breakdown as 'image_details'
         
         Returns:
             Insurance assessment report
@@ -263,49 +789,60 @@ class InsuranceFieldAnalyzer:
         if not image_paths:
             return {'error': 'No images provided'}
         
-        # Analyze individual images
-        damage_percentages = []
-        damage_votes = []
-        image_results = []
+        # Decode, RGB analysis and preprocessing in parallel (OpenCV/PIL
+        # release the GIL), then one batched classifier forward
+        workers = max(1, min(Config.PREPROCESS_WORKERS, len(image_paths), os.cpu_count() or 1))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            prepared = list(pool.map(self._prepare_image, image_paths))
         
-        for path in image_paths:
-            rgb_result = self.rgb_analyzer.analyze_single_image(path)
+        valid_paths = []
+        rgb_results = []
+        tensors = []
+        thumbnails = []
+        for path, (rgb_result, tensor, thumb) in zip(image_paths, prepared):
             if 'error' in rgb_result:
                 continue
-            
-            damage_percentages.append(rgb_result['damage_percentage'])
-            
-            dl_result = self.classify_damage_type(path)
-            if dl_result['confidence'] > 0:
-                damage_votes.append(dl_result['damage_type'])
-            
-            image_results.append({
-                'path': os.path.basename(path),
-                'rgb_damage_pct': rgb_result['damage_percentage'],
-                'dl_damage_type': dl_result['damage_type'],
-                'dl_confidence': dl_result['confidence']
-            })
-        
-        if not damage_percentages:
+            valid_paths.append(path)
+            rgb_results.append(rgb_result)
+            thumbnails.append(thumb)
+            if tensor is not None:
+                tensors.append(tensor)
+        
+        if self.classifier is None:
+            dl_results = [self._unknown_classification() for _ in valid_paths]
+        else:
+            dl_results = self.classify_damage_tensors(tensors)
+        
+        if not valid_paths:
             return {'error': 'No valid images processed'}
         
+        # Per-image results as parallel columns; dicts are only built for the report
+        damage_percentages = np.array([r['damage_percentage'] for r in rgb_results], dtype=np.float64)
+        dl_types = [r['damage_type'] for r in dl_results]
+        dl_confidences = np.array([r['confidence'] for r in dl_results], dtype=np.float64)
+        
+        # Classifier votes from images it actually scored
+        voted = dl_confidences > 0
+        damage_votes = np.array([_CLASS_TO_IDX.get(t, -1) for t in dl_types], dtype=np.int64)[voted]
+        
         # Overlap detection
-        overlap_score, effective_images = self.detect_overlaps(image_paths)
+        overlap_score, effective_images = self.detect_overlaps(valid_paths, thumbnails)
         
         # Damage consensus
-        damage_counts = Counter(damage_votes) if damage_votes else Counter()
-        if damage_counts:
-            primary_damage = damage_counts.most_common(1)[0][0]
-            damage_consistency = damage_counts[primary_damage] / len(damage_votes)
+        if len(damage_votes):
+            pred = majority_class(damage_votes, len(Config.DAMAGE_CLASSES))
+            primary_damage = Config.DAMAGE_CLASSES[pred]
+            damage_consistency = float(np.count_nonzero(damage_votes == pred) / len(damage_votes))
         else:
             primary_damage = 'unknown'
             damage_consistency = 0.0
         
         # Damage percentage range
-        damage_mean = np.mean(damage_percentages)
-        damage_std = np.std(damage_percentages)
-        damage_min = max(0, damage_mean - 2 * damage_std)
-        damage_max = min(100, damage_mean + 2 * damage_std)
+        damage_mean = damage_percentages.mean()
+        damage_std = damage_percentages.std()
+        damage_min, damage_max = np.clip(
+            [damage_mean - 2 * damage_std, damage_mean + 2 * damage_std], 0, 100
+        )
         
         # Area estimation
         if manual_field_area_m2:
@@ -315,10 +852,12 @@ class InsuranceFieldAnalyzer:
             total_area = effective_images * Config.DEFAULT_IMAGE_COVERAGE_M2
             area_method = "ESTIMATED"
         
+        # min / mean / max in one pass
         variance = Config.AREA_VARIANCE_FACTOR
-        damaged_area_mean = total_area * (damage_mean / 100)
-        damaged_area_min = total_area * (damage_min / 100) * (1 - variance)
-        damaged_area_max = total_area * (damage_max / 100) * (1 + variance)
+        damage_range = np.array([damage_min, damage_mean, damage_max])
+        damaged_area = total_area * (damage_range / 100) * np.array([1 - variance, 1.0, 1 + variance])
+        damaged_acres = damaged_area * _ACRES_PER_M2
+        damaged_area_min, damaged_area_mean, damaged_area_max = damaged_area
         
         # Coverage quality
         coverage_quality = self.get_coverage_quality(
@@ -333,17 +872,20 @@ class InsuranceFieldAnalyzer:
         )
         
         # Overall confidence
-        confidence_factors = [
+        confidence_factors = np.array([
             damage_consistency,
             1 - overlap_score,
             min(len(image_paths) / 8, 1.0),
             1 - (damage_std / 50) if damage_std < 50 else 0.0
-        ]
-        overall_confidence = np.mean(confidence_factors)
+        ])
+        overall_confidence = confidence_factors.mean()
         
-        return {
-            "assessment_id": f"INS_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-            "timestamp": datetime.now().isoformat(),
+        # One clock read, so assessment_id and timestamp name the same instant
+        now = datetime.now()
+        
+        report = {
+            "assessment_id": f"INS_{now:%Y%m%d_%H%M%S}",
+            "timestamp": now.isoformat(),
             
             "damage_type": primary_damage,
             "damage_type_name": Config.DAMAGE_NAMES.get(primary_damage, "Unknown"),
@@ -362,9 +904,9 @@ class InsuranceFieldAnalyzer:
             },
             
             "damaged_area_acres": {
-                "min": round(damaged_area_min / 4046.86, 4),
-                "mean": round(damaged_area_mean / 4046.86, 4),
-                "max": round(damaged_area_max / 4046.86, 4)
+                "min": round(damaged_acres[0], 4),
+                "mean": round(damaged_acres[1], 4),
+                "max": round(damaged_acres[2], 4)
             },
             
             "overall_confidence": round(overall_confidence, 3),
@@ -375,18 +917,40 @@ class InsuranceFieldAnalyzer:
             "effective_images": effective_images,
             "overlap_score": round(overlap_score, 3),
             "area_estimation_method": area_method,
-            "estimated_total_area_m2": round(total_area, 1),
-            
-            "image_details": image_results
+            "estimated_total_area_m2": round(total_area, 1)
         }
+        
+        if include_image_details:
+            report["image_details"] = [
+                {
+                    'path': os.path.basename(path),
+                    'rgb_damage_pct': pct,
+                    'dl_damage_type': dl_type,
+                    'dl_confidence': conf
+                }
+                for path, pct, dl_type, conf in zip(valid_paths, damage_percentages.tolist(),
+                                                    dl_types, dl_confidences.tolist())
+            ]
+        
+        return report
 
 
 # ============================================================================
 # EASY-USE FUNCTIONS
 # ============================================================================
+@lru_cache(maxsize=4)
+def get_analyzer(model_path: Optional[str] = None) -> InsuranceFieldAnalyzer:
+    """
+    Shared analyzer per model path, so the classifier is loaded once and stays
+    resident across claims. Call get_analyzer.cache_clear() after replacing a model file.
+    """
+    return InsuranceFieldAnalyzer(model_path=model_path)
+
+
 def assess_field_damage(image_paths: List[str],
                         manual_field_area_m2: Optional[float] = None,
-                        model_path: str = None) -> Dict:
+                        model_path: str = None,
+                        include_image_details: bool = False) -> Dict:
     """
     🔥 MAIN FUNCTION - Use this in your application!
     
@@ -394,6 +958,7 @@ def assess_field_damage(image_paths: List[str],
         image_paths: List of 4-10 image file paths
         manual_field_area_m2: Optional known field size in m²
         model_path: Path to trained .pth model file
+        include_image_details: Also return the per-image breakdown
     
     Returns:
         Insurance assessment report (dict)
@@ -407,8 +972,8 @@ def assess_field_damage(image_paths: List[str],
         print(report['damage_type'])       # 'WD'
         print(report['damage_percentage']) # {'min': 30.1, 'mean': 34.5, 'max': 38.9}
     """
-    analyzer = InsuranceFieldAnalyzer(model_path=model_path)
-    return analyzer.analyze_field(image_paths, manual_field_area_m2)
+    analyzer = get_analyzer(model_path)
+    return analyzer.analyze_field(image_paths, manual_field_area_m2, include_image_details)
 
 
 def print_insurance_report(report: Dict):
@@ -15,10 +15,16 @@ Usage:
 import os
 import sys
 import math
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional, Tuple, List
+
+import numpy as np
 from PIL import Image
 from PIL.ExifTags import TAGS, GPSTAGS
 
+EXIF_IFD_POINTER = 0x8769
+GPS_IFD_POINTER = 0x8825    # TAGS name: 'GPSInfo'
+
 
 class EXIFAreaCalculator:
     """
@@ -64,22 +70,40 @@ class EXIFAreaCalculator:
         Returns:
             Dict with EXIF tags or None if unavailable
         """
+        return self._get_exif_and_size(image_path)[0]
+    
+    def _get_exif_and_size(self, image_path: str) -> Tuple[Optional[Dict], Optional[Tuple[int, int]]]:
+        """
+        Extract EXIF data and (width, height) from one Image.open.
+        
+        Returns:
+            (Dict with EXIF tags or None, size or None)
+        """
         try:
-            img = Image.open(image_path)
-            exif_data = img._getexif()
-            
-            if exif_data is None:
-                return None
-            
-            # Convert tag IDs to names
-            exif = {}
-            for tag_id, value in exif_data.items():
-                tag_name = TAGS.get(tag_id, tag_id)
-                exif[tag_name] = value
-            
-            return exif
+            with Image.open(image_path) as img:
+                size = img.size
+                exif_data = img.getexif()
+                if not exif_data:
+                    return None, size
+                
+                # Public getexif() API; merge in the Exif and GPS sub-IFDs
+                # the way the private _getexif() did
+                tags = dict(exif_data)
+                tags.update(exif_data.get_ifd(EXIF_IFD_POINTER))
+                # Always replace the GPS pointer: an empty IFD must become {} (not
+                # stay the raw int offset) for _extract_gps_info
+                if GPS_IFD_POINTER in exif_data:
+                    tags[GPS_IFD_POINTER] = dict(exif_data.get_ifd(GPS_IFD_POINTER))
         except Exception as e:
-            return None
+            return None, None
+        
+        # Convert tag IDs to names
+        exif = {}
+        for tag_id, value in tags.items():
+            tag_name = TAGS.get(tag_id, tag_id)
+            exif[tag_name] = value
+        
+        return exif, size
     
     def _extract_gps_info(self, exif: Dict) -> Optional[Dict]:
         """
@@ -104,12 +128,8 @@ class EXIFAreaCalculator:
         # Extract altitude
         if 'GPSAltitude' in gps_data:
             try:
-                altitude = gps_data['GPSAltitude']
-                # Handle IFDRational type
-                if hasattr(altitude, 'numerator'):
-                    result['altitude_m'] = float(altitude.numerator) / float(altitude.denominator)
-                else:
-                    result['altitude_m'] = float(altitude)
+                # IFDRational supports float() directly
+                result['altitude_m'] = float(gps_data['GPSAltitude'])
             except:
                 pass
         
@@ -137,14 +157,7 @@ class EXIFAreaCalculator:
     
     def _convert_to_degrees(self, value) -> float:
         """Convert GPS coordinates to degrees."""
-        def to_float(v):
-            if hasattr(v, 'numerator'):
-                return float(v.numerator) / float(v.denominator)
-            return float(v)
-        
-        d = to_float(value[0])
-        m = to_float(value[1])
-        s = to_float(value[2])
+        d, m, s = (float(v) for v in value[:3])
         
         return d + (m / 60.0) + (s / 3600.0)
     
@@ -152,10 +165,7 @@ class EXIFAreaCalculator:
         """Extract focal length from EXIF."""
         if 'FocalLength' in exif:
             try:
-                fl = exif['FocalLength']
-                if hasattr(fl, 'numerator'):
-                    return float(fl.numerator) / float(fl.denominator)
-                return float(fl)
+                return float(exif['FocalLength'])
             except:
                 pass
         return None
@@ -215,21 +225,12 @@ class EXIFAreaCalculator:
             'longitude': None
         }
         
-        # Try to extract EXIF
-        exif = self._get_exif_data(image_path)
+        gps_info, size = self._get_gps_and_size(image_path)
         
-        if exif:
-            # Get image dimensions
-            try:
-                img = Image.open(image_path)
-                width, height = img.size
-            except:
-                width, height = None, None
-            
-            # Try to get GPS data
-            gps_info = self._extract_gps_info(exif)
+        if gps_info:
+            width, height = size
             
-            if gps_info and 'altitude_m' in gps_info:
+            if 'altitude_m' in gps_info:
                 altitude = gps_info['altitude_m']
                 coverage = self.calculate_ground_coverage(
                     altitude_m=altitude,
@@ -245,6 +246,29 @@ class EXIFAreaCalculator:
         
         return result
     
+    def _get_gps_and_size(self, image_path: str) -> Tuple[Optional[Dict], Optional[Tuple[int, int]]]:
+        """GPS info (or None) and image size from one EXIF read"""
+        # Try to extract EXIF (image dimensions come from the same open)
+        exif, size = self._get_exif_and_size(image_path)
+        if not exif:
+            return None, size
+        return self._extract_gps_info(exif), size
+    
+    def calculate_ground_coverage_array(self, altitudes_m: np.ndarray,
+                                        widths: np.ndarray,
+                                        heights: np.ndarray,
+                                        fov_degrees: float = None) -> np.ndarray:
+        """
+        Vectorized calculate_ground_coverage over many images.
+        Widths/heights of 0 mean unknown (square footprint assumed).
+        """
+        fov = fov_degrees or self.default_fov
+        ground_width = 2 * altitudes_m * math.tan(math.radians(fov) / 2)
+        
+        known = (widths > 0) & (heights > 0)
+        aspect_ratio = np.divide(widths, heights, out=np.ones(len(widths)), where=known)
+        return ground_width * (ground_width / aspect_ratio)
+    
     def get_total_coverage(self, image_paths: List[str], 
                            overlap_factor: float = 1.0) -> Dict:
         """
@@ -257,23 +281,36 @@ class EXIFAreaCalculator:
         Returns:
             Dict with total coverage, per-image details, method breakdown
         """
-        coverages = []
-        exif_count = 0
-        estimated_count = 0
+        # EXIF reads are I/O-bound; run them concurrently
+        workers = max(1, min(8, len(image_paths)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            reads = list(pool.map(self._get_gps_and_size, image_paths))
         
-        for path in image_paths:
-            coverage = self.get_image_coverage(path)
+        # All coverages in one vectorized expression
+        gps_list = [gps if gps and 'altitude_m' in gps else None for gps, _ in reads]
+        has_altitude = np.array([gps is not None for gps in gps_list], dtype=bool)
+        altitudes = np.array([gps['altitude_m'] if gps else 0.0 for gps in gps_list], dtype=np.float64)
+        sizes = np.array([size if size else (0, 0) for _, size in reads], dtype=np.float64).reshape(-1, 2)
+        coverage_m2 = np.where(
+            has_altitude,
+            self.calculate_ground_coverage_array(altitudes, sizes[:, 0], sizes[:, 1]),
+            self.DEFAULT_COVERAGE_M2
+        )
+        
+        coverages = []
+        for path, gps, coverage in zip(image_paths, gps_list, coverage_m2.tolist()):
             coverages.append({
                 'path': os.path.basename(path),
-                **coverage
+                'coverage_m2': coverage,
+                'method': 'EXIF' if gps else 'ESTIMATED',
+                'altitude_m': gps['altitude_m'] if gps else None,
+                'latitude': gps.get('latitude') if gps else None,
+                'longitude': gps.get('longitude') if gps else None
             })
-            
-            if coverage['method'] == 'EXIF':
-                exif_count += 1
-            else:
-                estimated_count += 1
         
-        total_coverage = sum(c['coverage_m2'] for c in coverages) * overlap_factor
+        exif_count = int(has_altitude.sum())
+        estimated_count = len(image_paths) - exif_count
+        total_coverage = float(coverage_m2.sum()) * overlap_factor
         
         # Determine overall method
         if exif_count == len(image_paths):
@@ -1,8 +1,32 @@
 
-from typing import List, Dict
+from typing import List, Dict, Union
 from datetime import datetime, timedelta
 import numpy as np
 
+# Per-image details: either a list of dicts (one per image) or a dict of
+# parallel columns {'filename': [...], 'exif_timestamp': [...], 'software': [...]}
+ImageDetails = Union[List[Dict], Dict[str, List]]
+
+EDITING_TOOLS = ('photoshop', 'gimp', 'editor', 'paint')
+
+
+def _column(image_details: ImageDetails, key: str, default) -> List:
+    """One field for all images, from either layout"""
+    if isinstance(image_details, dict):
+        return image_details.get(key) or [default] * len(next(iter(image_details.values()), []))
+    return [img.get(key, default) for img in image_details]
+
+
+def _parse_exif_timestamp(ts: str) -> np.datetime64:
+    """EXIF "YYYY:MM:DD HH:MM:SS" -> datetime64[us], NaT if missing/invalid"""
+    if not ts:
+        return np.datetime64('NaT', 'us')
+    try:
+        # Clean up standard EXIF format
+        return np.datetime64(datetime.strptime(ts.replace('\x00', ''), '%Y:%m:%d %H:%M:%S'), 'us')
+    except ValueError:
+        return np.datetime64('NaT', 'us')
+
 class FraudDetector:
     """
     Detects suspicious patterns and potential fraud in claims.
@@ -16,35 +40,26 @@ class FraudDetector:
         }
         self.AUTO_REJECT_SCORE = 0.9
 
-    def verify_exif_timestamps(self, image_details: List[Dict], claim_timestamp: datetime) -> Dict:
+    def verify_exif_timestamps(self, image_details: ImageDetails, claim_timestamp: datetime) -> Dict:
         """
         Verify EXIF capture timestamps against claim submission time.
         """
-        issues = []
-        valid_timestamps = 0
+        # Standard format "YYYY:MM:DD HH:MM:SS"
+        exif_ts = np.array([_parse_exif_timestamp(ts) for ts in _column(image_details, 'exif_timestamp', None)],
+                           dtype='datetime64[us]')
+        filenames = _column(image_details, 'filename', '?')
         
-        for img in image_details:
-             # This assumes image_details has 'exif' dict possibly populated
-             # In main_pipeline we need to ensure this is passed through
-             exif_ts_str = img.get('exif_timestamp') # Standard format "YYYY:MM:DD HH:MM:SS"
-             
-             if not exif_ts_str:
-                 continue
-
-             try:
-                 # Clean up standard EXIF format
-                 exif_ts = datetime.strptime(exif_ts_str.replace('\x00', ''), '%Y:%m:%d %H:%M:%S')
-                 valid_timestamps += 1
-                 
-                 # Check age
-                 age = claim_timestamp - exif_ts
-                 if age.days > 30:
-                     issues.append(f"Image {img.get('filename','?')} is old ({age.days} days)")
-                 elif age.days < -1: # Future timestamp
-                     issues.append(f"Image {img.get('filename','?')} has future timestamp")
-                     
-             except ValueError:
-                 pass
+        # Image ages in whole days for all images at once (floor, like timedelta.days)
+        valid = ~np.isnat(exif_ts)
+        valid_timestamps = int(valid.sum())
+        age_days = (np.datetime64(claim_timestamp, 'us') - exif_ts[valid]) // np.timedelta64(1, 'D')
+        
+        issues = []
+        for name, days in zip(np.asarray(filenames, dtype=object)[valid], age_days.tolist()):
+            if days > 30:
+                issues.append(f"Image {name} is old ({days} days)")
+            elif days < -1: # Future timestamp
+                issues.append(f"Image {name} has future timestamp")
         
         score = 1.0
         if valid_timestamps > 0:
@@ -61,15 +76,16 @@ class FraudDetector:
             'valid_count': valid_timestamps
         }
 
-    def detect_metadata_tampering(self, image_details: List[Dict]) -> Dict:
+    def detect_metadata_tampering(self, image_details: ImageDetails) -> Dict:
         """
         Check for software modification traces in metadata.
         """
         software_traces = []
-        for img in image_details:
-            software = img.get('software', '').lower()
-            if any(tool in software for tool in ['photoshop', 'gimp', 'editor', 'paint']):
-                software_traces.append(f"Image {img.get('filename')} edited with {software}")
+        for name, software in zip(_column(image_details, 'filename', None),
+                                  _column(image_details, 'software', '')):
+            software = software.lower()
+            if any(tool in software for tool in EDITING_TOOLS):
+                software_traces.append(f"Image {name} edited with {software}")
         
         score = 1.0
         if software_traces:
@@ -1,9 +1,64 @@
 
 import math
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Union
 import numpy as np
 from collections import Counter
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    def _cluster_stats(lat, lon, lat_c, lon_c, radius_km):
+        """
+        Haversine spread of a cluster around its center in one compiled pass.
+        Returns (max_km, mean_km, std_km, indices beyond 2 sigma and 500m).
+        """
+        n = lat.shape[0]
+        rlat_c = math.radians(lat_c)
+        rlon_c = math.radians(lon_c)
+        cos_c = math.cos(rlat_c)
+
+        # Welford running mean/variance: one pass, no second sweep for the std
+        distances = np.empty(n)
+        mean = 0.0
+        m2 = 0.0
+        max_dist = 0.0
+        for i in range(n):
+            rlat = math.radians(lat[i])
+            a = (math.sin((rlat - rlat_c) * 0.5) ** 2 +
+                 cos_c * math.cos(rlat) * math.sin((math.radians(lon[i]) - rlon_c) * 0.5) ** 2)
+            d = 2.0 * radius_km * math.asin(math.sqrt(min(a, 1.0)))
+            distances[i] = d
+            delta = d - mean
+            mean += delta / (i + 1)
+            m2 += delta * (d - mean)
+            if d > max_dist:
+                max_dist = d
+        std = math.sqrt(max(m2, 0.0) / n)
+
+        outliers = np.empty(n, dtype=np.int64)
+        count = 0
+        for i in range(n):
+            if abs(distances[i] - mean) > 2.0 * std and distances[i] > 0.5:
+                outliers[count] = i
+                count += 1
+        return max_dist, mean, std, outliers[:count]
+
+    # Explicit signature: compiled at import (cached on disk), not on the first claim
+    _CLUSTER_STATS_SIG = ('Tuple((float64, float64, float64, int64[:]))'
+                          '(float64[::1], float64[::1], float64, float64, float64)')
+    try:
+        _cluster_stats = njit(_CLUSTER_STATS_SIG, fastmath=True, cache=True)(_cluster_stats)
+    except ImportError:
+        # The disk cache was written with this file imported under another
+        # module name (e.g. bare vs modules.geolocation_verifier); compile fresh
+        _cluster_stats = njit(_CLUSTER_STATS_SIG, fastmath=True)(_cluster_stats)
+
+
 class GeolocationVerifier:
     """
     Verifies geolocation data consistency and validity.
@@ -13,6 +68,11 @@ class GeolocationVerifier:
         self.MAX_CLUSTER_SPREAD_KM = 5.0
         self.WARNING_THRESHOLD_KM = 2.0
         self.EARTH_RADIUS_KM = 6371.0
+        # Clusters tighter than this use the flat-earth approximation
+        self.EQUIRECTANGULAR_MAX_KM = 50.0
+        # From this many points haversine_distances uses scikit-learn's
+        # compiled haversine, when installed
+        self.LARGE_CLUSTER_POINTS = 1000
 
     def haversine_distance(self, coord1: Dict, coord2: Dict) -> float:
         """
@@ -26,80 +86,215 @@ class GeolocationVerifier:
         dlon = lon2 - lon1
 
         a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
+        c = 2 * math.asin(math.sqrt(min(a, 1.0)))
 
         return self.EARTH_RADIUS_KM * c
 
-    def get_center_coordinate(self, coordinates: List[Dict]) -> Dict:
+    def haversine_distances(self, center: Dict, lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+        """
+        Vectorized haversine_distance: km from center to every point of the
+        lat/lon degree arrays.
+        """
+        lat_c, lon_c = math.radians(center['lat']), math.radians(center['lon'])
+        if len(lat) >= self.LARGE_CLUSTER_POINTS:
+            # Imported only here: scikit-learn is slow to import and most
+            # claims never get this many points
+            try:
+                from sklearn.metrics.pairwise import haversine_distances as sklearn_haversine
+            except ImportError:
+                sklearn_haversine = None
+            if sklearn_haversine is not None:
+                # (N, 2) radians [lat, lon] against the center; result is in units of R
+                points = np.radians(np.column_stack((lat, lon)))
+                return self.EARTH_RADIUS_KM * sklearn_haversine(points, [[lat_c, lon_c]]).ravel()
+
+        cos_lat_c = math.cos(lat_c)  # scalar, broadcast as a constant
+        lat, lon = np.radians(lat), np.radians(lon)
+
+        a = np.sin((lat - lat_c) * 0.5)**2 + cos_lat_c * np.cos(lat) * np.sin((lon - lon_c) * 0.5)**2
+        # arcsin form: one sqrt instead of atan2's two (a can round past 1)
+        c = 2 * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+        return self.EARTH_RADIUS_KM * c
+
+    def equirectangular_distances(self, center: Dict, lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+        """
+        Equirectangular approximation of haversine_distances with no trig per
+        point. The longitude scale is cos of the mid latitude, expanded to first
+        order around the center (sub-millimetre error at a few km).
+        """
+        # Offsets from the center are taken in float64 (absolute coordinates need
+        # it); at cluster scale they fit float32, which halves the bytes and
+        # doubles the SIMD lanes for the rest (~0.1m resolution at 5km)
+        lat_c = math.radians(center['lat'])
+        dlat = np.radians(lat - center['lat']).astype(np.float32)
+        dlon = np.radians(lon - center['lon']).astype(np.float32)
+        lon_scale = np.float32(math.cos(lat_c)) - np.float32(0.5 * math.sin(lat_c)) * dlat
+        return np.float32(self.EARTH_RADIUS_KM) * np.hypot(dlat, dlon * lon_scale)
+
+    def cluster_spread(self, lat: np.ndarray, lon: np.ndarray,
+                       center: Dict) -> Tuple[float, float, float, np.ndarray]:
+        """
+        (max_km, mean_km, std_km, outlier indices) of the points' distances
+        from center; outliers lie beyond 2 sigma and 500m.
+        """
+        if NUMBA_AVAILABLE:
+            return _cluster_stats(lat, lon, center['lat'], center['lon'], self.EARTH_RADIUS_KM)
+
+        # Spread statistics are reductions over the one distances buffer;
+        # exact haversine only once the cluster is too wide for the projection
+        distances = self.equirectangular_distances(center, lat, lon)
+        if distances.max() > self.EQUIRECTANGULAR_MAX_KM:
+            distances = self.haversine_distances(center, lat, lon)
+        max_dist = float(distances.max())
+        avg_dist = float(distances.mean())
+        # Population std from the mean already computed (np.std would redo it)
+        deviation = np.abs(distances - avg_dist)
+        std_dev = math.sqrt(np.dot(deviation, deviation) / len(deviation))
+
+        outliers = np.flatnonzero((deviation > 2 * std_dev) & (distances > 0.5))
+        return max_dist, avg_dist, std_dev, outliers
+
+    @staticmethod
+    def to_coordinate_array(coordinates: Union[List[Dict], np.ndarray]) -> np.ndarray:
+        """
+        (N, 2) float64 array of [lat, lon] rows.
+        Accepts an existing array or a list of {'lat': float, 'lon': float}.
+        """
+        if isinstance(coordinates, np.ndarray):
+            return coordinates.astype(np.float64, copy=False).reshape(-1, 2)
+        return np.array([(c['lat'], c['lon']) for c in coordinates], dtype=np.float64).reshape(-1, 2)
+
+    @staticmethod
+    def to_coordinate_columns(coordinates: Union[List[Dict], np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Contiguous float64 (lat, lon) arrays from an (N, 2) [lat, lon] array or
+        a list of {'lat': float, 'lon': float}.
+        """
+        if isinstance(coordinates, np.ndarray):
+            coords = GeolocationVerifier.to_coordinate_array(coordinates)
+            return np.ascontiguousarray(coords[:, 0]), np.ascontiguousarray(coords[:, 1])
+        n = len(coordinates)
+        lat = np.fromiter((c['lat'] for c in coordinates), dtype=np.float64, count=n)
+        lon = np.fromiter((c['lon'] for c in coordinates), dtype=np.float64, count=n)
+        return lat, lon
+
+    def get_center_coordinate(self, coordinates: Union[List[Dict], np.ndarray]) -> Dict:
         """Calculate centroid of coordinates"""
-        if not coordinates:
+        coords = self.to_coordinate_array(coordinates)
+        if len(coords) == 0:
             return None
         
-        avg_lat = sum(c['lat'] for c in coordinates) / len(coordinates)
-        avg_lon = sum(c['lon'] for c in coordinates) / len(coordinates)
+        avg_lat, avg_lon = coords.mean(axis=0)
         
-        return {'lat': avg_lat, 'lon': avg_lon}
+        return {'lat': float(avg_lat), 'lon': float(avg_lon)}
 
-    def analyze_coordinate_cluster(self, coordinates: List[Dict]) -> Dict:
+    def analyze_coordinate_cluster(self, coordinates: Union[List[Dict], np.ndarray],
+                                   verbose: bool = True) -> Dict:
         """
-        Analyze spread and consistency of a list of coordinates.
+        Analyze spread and consistency of a list of coordinates
+        (list of {'lat', 'lon'} dicts or an (N, 2) [lat, lon] array).
+        With verbose=False the 'details' messages are not formatted (empty list).
         """
-        if not coordinates or len(coordinates) == 0:
+        lat, lon = self.to_coordinate_columns(coordinates)
+        if len(lat) == 0:
             return {
                 'status': 'WARNING',
                 'score': 0.5,
                 'details': ['No coordinates provided']
             }
 
-        center = self.get_center_coordinate(coordinates)
-        
-        # Calculate max spread
-        max_dist = 0
-        distances = []
-        
-        for coord in coordinates:
-            dist = self.haversine_distance(center, coord)
-            distances.append(dist)
-            if dist > max_dist:
-                max_dist = dist
+        center = {'lat': float(lat.mean()), 'lon': float(lon.mean())}
         
-        avg_dist = sum(distances) / len(distances) if distances else 0
+        max_dist, avg_dist, std_dev, outlier_idx = self.cluster_spread(lat, lon, center)
+        # Only if we have enough points and some spread; outlier_idx already holds
+        # the points beyond 2 sigma and 500m (none when std_dev is 0)
+        outlier_count = len(outlier_idx) if len(lat) >= 3 and avg_dist > 0.01 else 0
         
-        # Determine status
-        score = 1.0
+        return self._cluster_result(center, max_dist, avg_dist, outlier_count, verbose)
+
+    def analyze_many(self, clusters: List[Union[List[Dict], np.ndarray]],
+                     verbose: bool = True) -> List[Dict]:
+        """
+        analyze_coordinate_cluster for many claims at once. All points go into
+        one ragged lat/lon array and per-claim statistics come from reduceat,
+        so the NumPy work is a fixed number of calls regardless of claim count.
+        """
+        columns = [self.to_coordinate_columns(c) for c in clusters]
+        counts = np.array([len(lat) for lat, _ in columns], dtype=np.int64)
+        results = [None] * len(clusters)
+
+        nonempty = np.flatnonzero(counts)
+        if len(nonempty):
+            n = counts[nonempty]
+            starts = np.concatenate(([0], np.cumsum(n)[:-1]))
+            owner = np.repeat(np.arange(len(n)), n)
+            lat = np.concatenate([columns[i][0] for i in nonempty])
+            lon = np.concatenate([columns[i][1] for i in nonempty])
+
+            lat_c = np.add.reduceat(lat, starts) / n
+            lon_c = np.add.reduceat(lon, starts) / n
+
+            # Haversine from each point to its own claim's center
+            rlat, rlat_c = np.radians(lat), np.radians(lat_c)
+            a = (np.sin((rlat - rlat_c[owner]) * 0.5)**2 +
+                 np.cos(rlat_c)[owner] * np.cos(rlat) *
+                 np.sin((np.radians(lon) - np.radians(lon_c)[owner]) * 0.5)**2)
+            distances = self.EARTH_RADIUS_KM * 2 * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+            max_dist = np.maximum.reduceat(distances, starts)
+            avg_dist = np.add.reduceat(distances, starts) / n
+            deviation = np.abs(distances - avg_dist[owner])
+            std_dev = np.sqrt(np.add.reduceat(deviation * deviation, starts) / n)
+            outlier = (deviation > 2 * std_dev[owner]) & (distances > 0.5)
+            outlier_count = np.add.reduceat(outlier.astype(np.int64), starts)
+            outlier_count[(n < 3) | (avg_dist <= 0.01)] = 0
+
+            for k, i in enumerate(nonempty):
+                center = {'lat': float(lat_c[k]), 'lon': float(lon_c[k])}
+                results[i] = self._cluster_result(center, float(max_dist[k]), float(avg_dist[k]),
+                                                  int(outlier_count[k]), verbose)
+
+        for i in np.flatnonzero(counts == 0):
+            results[i] = self.analyze_coordinate_cluster([], verbose)
+        return results
+
+    def _cluster_result(self, center: Dict, max_dist: float, avg_dist: float,
+                        outlier_count: int, verbose: bool = True) -> Dict:
+        """
+        Status, score and details of a cluster from its spread statistics.
+        Spreads are returned unrounded; round them when presenting. Details are
+        only formatted when verbose.
+        """
+        # Determine status (score kept in integer tenths, so it needs no rounding)
+        score_tenths = 10
         status = 'PASS'
         details = []
         
         if max_dist > self.MAX_CLUSTER_SPREAD_KM:
             status = 'FAIL'
-            score = 0.2
-            details.append(f"Extreme coordinate spread: {max_dist:.2f}km (> {self.MAX_CLUSTER_SPREAD_KM}km)")
+            score_tenths = 2
+            if verbose:
+                details.append(f"Extreme coordinate spread: {max_dist:.2f}km (> {self.MAX_CLUSTER_SPREAD_KM}km)")
         elif max_dist > self.WARNING_THRESHOLD_KM:
             status = 'WARNING'
-            score = 0.6
-            details.append(f"Wide coordinate spread: {max_dist:.2f}km")
-        else:
+            score_tenths = 6
+            if verbose:
+                details.append(f"Wide coordinate spread: {max_dist:.2f}km")
+        elif verbose:
             details.append(f"Coordinates clustered within {max_dist:.2f}km")
 
-        # Detect outliers (Z-score like approach)
-        outliers = []
-        if len(distances) >= 3 and avg_dist > 0.01: # Only if we have enough points and some spread
-             std_dev = np.std(distances)
-             if std_dev > 0:
-                 for i, dist in enumerate(distances):
-                     if abs(dist - avg_dist) > 2 * std_dev and dist > 0.5: # 2 sigma and at least 500m
-                         outliers.append(i)
-        
-        if outliers:
-            score -= (len(outliers) * 0.1)
-            details.append(f"Detected {len(outliers)} outlier locations")
+        if outlier_count:
+            score_tenths -= outlier_count
+            if verbose:
+                details.append(f"Detected {outlier_count} outlier locations")
 
         return {
             'status': status,
-            'score': round(max(0.0, min(1.0, score)), 2),
+            'score': max(0, score_tenths) / 10,
             'center': center,
-            'max_spread_km': round(max_dist, 2),
-            'avg_spread_km': round(avg_dist, 2),
-            'outlier_count': len(outliers),
+            'max_spread_km': max_dist,
+            'avg_spread_km': avg_dist,
+            'outlier_count': outlier_count,
             'details': details
         }
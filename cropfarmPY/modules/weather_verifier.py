@@ -1,43 +1,88 @@
 import os
 import sys
+import time
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 import json
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+# Current-weather responses keyed by coordinates rounded to 0.01 deg (~1 km)
+# and the hour, so every photo of a claim cluster shares one API call; the
+# hour in the key expires entries
+_WEATHER_CACHE_MAX = 1024
+_weather_cache: Dict[Tuple[float, float, int], Dict] = {}
+_weather_cache_lock = threading.Lock()
+
+
+def _weather_cache_key(lat: float, lon: float) -> Tuple[float, float, int]:
+    return round(float(lat), 2), round(float(lon), 2), int(time.time() // 3600)
+
+
+# One keep-alive pool for the process, shared by every WeatherVerifier, so
+# repeat calls (including later claims) skip the TCP/TLS handshake
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            _session.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=16))
+        return _session
+
+
+# Weather rules per damage code, built once and read-only: the condition sets
+# are frozensets of interned literals (fetch_weather_data interns the API's
+# condition string too, so membership tests hit the identity fast path)
+DAMAGE_WEATHER_CORRELATION = MappingProxyType({
+    'DR': MappingProxyType({ # Drought
+        'supporting': frozenset({'Clear', 'Clouds'}),
+        'contradicting': frozenset({'Rain', 'Thunderstorm', 'Drizzle', 'Snow'}),
+        'min_temp': 30,
+        'max_humidity': 40
+    }),
+    'ND': MappingProxyType({ # Nutrient Deficiency
+        'supporting': frozenset({'Rain', 'Extreme', 'Clear', 'Clouds'}), # Broad support
+        'contradicting': frozenset()
+    }),
+    'WD': MappingProxyType({ # Weed Damage
+        'supporting': frozenset({'Rain', 'Clear', 'Clouds', 'Drizzle'}),
+        'contradicting': frozenset({'Snow', 'Extreme'})
+    }),
+    'G': MappingProxyType({ # Good/Healthy
+        'supporting': frozenset({'Clear', 'Clouds', 'Rain'}),
+        'contradicting': frozenset({'Extreme'})
+    }),
+    'other': MappingProxyType({
+        'supporting': frozenset(),
+        'contradicting': frozenset()
+    })
+})
+
 
 class WeatherVerifier:
     """
     Verifies weather conditions against claimed damage type.
     """
     
-    DAMAGE_WEATHER_CORRELATION = {
-        'DR': { # Drought
-            'supporting': ['Clear', 'Clouds'],
-            'contradicting': ['Rain', 'Thunderstorm', 'Drizzle', 'Snow'],
-            'min_temp': 30,
-            'max_humidity': 40
-        },
-        'ND': { # Nutrient Deficiency
-            'supporting': ['Rain', 'Extreme', 'Clear', 'Clouds'], # Broad support
-            'contradicting': []
-        },
-        'WD': { # Weed Damage
-            'supporting': ['Rain', 'Clear', 'Clouds', 'Drizzle'],
-            'contradicting': ['Snow', 'Extreme']
-        },
-        'G': { # Good/Healthy
-            'supporting': ['Clear', 'Clouds', 'Rain'],
-            'contradicting': ['Extreme']
-        },
-        'other': {
-            'supporting': [],
-            'contradicting': []
-        }
-    }
+    DAMAGE_WEATHER_CORRELATION = DAMAGE_WEATHER_CORRELATION
+
+    # Concurrent requests in fetch_weather_batch
+    MAX_FETCH_WORKERS = 8
 
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or os.environ.get('WEATHER_API_KEY')
         self.base_url = "https://api.openweathermap.org/data/2.5"
+        # Per-code verify_damage_correlation, specialized from the rule table
+        self._verifiers = {code: self._build_verifier(code, correlation)
+                           for code, correlation in self.DAMAGE_WEATHER_CORRELATION.items()}
 
     def fetch_weather_data(self, lat: float, lon: float, timestamp: Optional[float] = None) -> Dict:
         """
@@ -48,6 +93,12 @@ class WeatherVerifier:
              print("[WARNING] Weather API Key missing. Using mock data.", file=sys.stderr)
              return self._get_mock_weather_data(lat, lon)
 
+        key = _weather_cache_key(lat, lon)
+        with _weather_cache_lock:
+            cached = _weather_cache.get(key)
+        if cached is not None:
+            return dict(cached)
+
         try:
             # For this implementation, we'll accept Current Weather data as a proxy 
             # In a full production system with paid API plan, we'd use Historical API
@@ -59,57 +110,104 @@ class WeatherVerifier:
                 'units': 'metric'
             }
             
-            response = requests.get(url, params=params, timeout=5)
+            response = _get_session().get(url, params=params, timeout=5)
             response.raise_for_status()
             data = response.json()
             
-            return {
+            result = {
                 'temp': data['main']['temp'],
                 'humidity': data['main']['humidity'],
-                'condition': data['weather'][0]['main'],
+                'condition': sys.intern(data['weather'][0]['main']),
                 'description': data['weather'][0]['description'],
                 'wind_speed': data['wind']['speed'],
                 'timestamp': datetime.now().isoformat(),
                 'source': 'OpenWeatherMap'
             }
+            with _weather_cache_lock:
+                if len(_weather_cache) >= _WEATHER_CACHE_MAX:
+                    # Drop past hours first; if the current hour alone fills it, start over
+                    for stale in [k for k in _weather_cache if k[2] != key[2]]:
+                        del _weather_cache[stale]
+                    if len(_weather_cache) >= _WEATHER_CACHE_MAX:
+                        _weather_cache.clear()
+                _weather_cache[key] = result
+            return dict(result)
 
         except Exception as e:
             print(f"[ERROR] Weather API Error: {str(e)}", file=sys.stderr)
             return self._get_mock_weather_data(lat, lon)
 
+    def fetch_weather_batch(self, coords: List[Tuple[float, float]],
+                            timestamp: Optional[float] = None) -> List[Dict]:
+        """
+        fetch_weather_data for many (lat, lon) points, issued concurrently over
+        the shared session. Points sharing a cache cell are fetched once.
+        Results are in input order.
+        """
+        if not coords:
+            return []
+
+        # One representative point per cache cell. Keys are taken once, up
+        # front: they include the hour, which may roll over during the fetch
+        keys = [_weather_cache_key(lat, lon) for lat, lon in coords]
+        cells = {}
+        for key, point in zip(keys, coords):
+            cells.setdefault(key, point)
+
+        workers = min(self.MAX_FETCH_WORKERS, len(cells))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            fetched = dict(zip(cells, pool.map(lambda c: self.fetch_weather_data(c[0], c[1], timestamp),
+                                               cells.values())))
+        return [dict(fetched[key]) for key in keys]
+
     def verify_damage_correlation(self, weather_data: Dict, damage_type_code: str) -> Dict:
         """
         Verify if weather supports the damage type.
         """
-        correlation = self.DAMAGE_WEATHER_CORRELATION.get(damage_type_code, self.DAMAGE_WEATHER_CORRELATION['other'])
-        
-        condition = weather_data.get('condition', 'Unknown')
-        temp = weather_data.get('temp', 25)
-        humidity = weather_data.get('humidity', 50)
-        
-        score = 0.5
-        status = 'NEUTRAL'
-        details = []
-
-        # Condition check
-        if condition in correlation['supporting']:
-            score += 0.3
-            details.append(f"Weather '{condition}' supports '{damage_type_code}'")
-        elif condition in correlation['contradicting']:
-            score -= 0.4
-            status = 'MISMATCH'
-            details.append(f"Weather '{condition}' contradicts '{damage_type_code}'")
-
-        # Specific Drought checks
-        if damage_type_code == 'DR':
-            if temp > correlation.get('min_temp', 30):
+        verifier = self._verifiers.get(damage_type_code)
+        if verifier is None:
+            verifier = self._build_verifier(damage_type_code, self.DAMAGE_WEATHER_CORRELATION['other'])
+        return verifier(weather_data)
+
+    def _build_verifier(self, damage_type_code: str, correlation: Dict) -> Callable[[Dict], Dict]:
+        """
+        verify_damage_correlation specialized for one damage code: its rule
+        sets, thresholds and message suffixes are bound once, so a call does
+        no rule lookups and only drought carries the temperature/humidity checks.
+        """
+        supporting, contradicting = correlation['supporting'], correlation['contradicting']
+        supports, contradicts = f"' supports '{damage_type_code}'", f"' contradicts '{damage_type_code}'"
+        finish = self._correlation_result
+
+        # Condition check -> (score, status, details)
+        def check_condition(condition):
+            if condition in supporting:
+                return 0.5 + 0.3, 'NEUTRAL', [f"Weather '{condition}{supports}"]
+            if condition in contradicting:
+                return 0.5 - 0.4, 'MISMATCH', [f"Weather '{condition}{contradicts}"]
+            return 0.5, 'NEUTRAL', []
+
+        if damage_type_code != 'DR':
+            def verify(weather_data):
+                score, status, details = check_condition(weather_data.get('condition', 'Unknown'))
+                return finish(score, status, weather_data, details)
+            return verify
+
+        min_temp, max_humidity = correlation.get('min_temp', 30), correlation.get('max_humidity', 40)
+
+        def verify_drought(weather_data):
+            get = weather_data.get
+            temp, humidity = get('temp', 25), get('humidity', 50)
+            score, status, details = check_condition(get('condition', 'Unknown'))
+
+            if temp > min_temp:
                 score += 0.2
                 details.append(f"High temp ({temp}°C) supports Drought")
             elif temp < 20: 
                 score -= 0.2
                 details.append(f"Low temp ({temp}°C) contradicts Drought")
             
-            if humidity < correlation.get('max_humidity', 40):
+            if humidity < max_humidity:
                 score += 0.1
                 details.append(f"Low humidity ({humidity}%) supports Drought")
             elif humidity > 80:
@@ -117,6 +215,12 @@ class WeatherVerifier:
                 status = 'MISMATCH'
                 details.append(f"High humidity ({humidity}%) contradicts Drought")
 
+            return finish(score, status, weather_data, details)
+        return verify_drought
+
+    @staticmethod
+    def _correlation_result(score: float, status: str, weather_data: Dict, details: List[str]) -> Dict:
+        """Clamp the score and build verify_damage_correlation's result"""
         score = max(0.1, min(0.99, score))
         
         if score > 0.7: status = 'MATCH'